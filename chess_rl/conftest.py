@@ -1,3 +1,14 @@
 """
 Script to enable running tests from the chess_rl directory
-"""
\ No newline at end of file
+
+Puts the chess_rl directory on sys.path, so test_board_api.py imports
+``game`` as a top-level package when pytest is run from the repository
+root. Run as a script it gets the same path from Python itself.
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
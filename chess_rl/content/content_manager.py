@@ -5,7 +5,18 @@ Content Manager for accessing and organizing educational content.
 import json
 import os
 import importlib
-from typing import Dict, List, Any, Optional, Union
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+from content.xiangqi_lessons import thaw_lesson
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize read-only lesson mappings that json does not know about."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class ContentManager:
@@ -27,12 +38,24 @@ class ContentManager:
         self.xiangqi_lessons = {}
         self.custom_lessons = {}
         
+        # Topic vocabulary as bit flags, and each lesson's topics as a mask
+        # keyed by id() of the lesson object, since custom lessons may reuse
+        # a built-in lesson id
+        self._topic_bits: Dict[str, int] = {}
+        self._topic_masks: Dict[int, int] = {}
+        
+        # Bumped whenever the lesson set changes so callers can drop caches
+        self.content_version = 0
+        
         # Load default content
         from content.chess_lessons import CHESS_LESSONS
         from content.xiangqi_lessons import XIANGQI_LESSONS
         
         self.chess_lessons = CHESS_LESSONS
-        self.xiangqi_lessons = XIANGQI_LESSONS
+        # XIANGQI_LESSONS is a lazy read-only mapping; take a dict copy so
+        # external content can be merged in. The lesson values stay shared,
+        # read-only proxies and are handed out as-is by get_lesson().
+        self.xiangqi_lessons = dict(XIANGQI_LESSONS)
         
         # If external content directory provided, load that too
         if content_dir:
@@ -43,6 +66,36 @@ class ContentManager:
             custom_dir = os.path.join(content_dir, 'custom')
             if os.path.exists(custom_dir):
                 self._load_custom_lessons(custom_dir)
+        
+        self._lessons_changed()
+    
+    def _lessons_changed(self) -> None:
+        """Refresh derived lookup data after lessons are loaded or edited."""
+        self._rebuild_topic_index()
+        self.content_version += 1
+    
+    def _rebuild_topic_index(self) -> None:
+        """Rebuild the topic bit flags and per-lesson topic masks."""
+        topic_bits: Dict[str, int] = {}
+        topic_masks: Dict[int, int] = {}
+        for lessons in (self.chess_lessons, self.xiangqi_lessons, self.custom_lessons):
+            for lesson in lessons.values():
+                mask = 0
+                for topic in lesson.get('topics', []):
+                    bit = topic_bits.get(topic)
+                    if bit is None:
+                        bit = topic_bits[topic] = 1 << len(topic_bits)
+                    mask |= bit
+                topic_masks[id(lesson)] = mask
+        self._topic_bits = topic_bits
+        self._topic_masks = topic_masks
+    
+    def _topics_to_mask(self, topics: List[str]) -> int:
+        """Combine topic names into a bit mask; unknown topics contribute nothing."""
+        mask = 0
+        for topic in topics:
+            mask |= self._topic_bits.get(topic, 0)
+        return mask
     
     def _load_external_content(self, content_dir: str) -> None:
         """Load content from external directory."""
@@ -90,7 +143,10 @@ class ContentManager:
         """
         for key, value in new_content.items():
             if key in base_content:
-                if isinstance(value, dict) and isinstance(base_content[key], dict):
+                if isinstance(value, dict) and isinstance(base_content[key], Mapping):
+                    if not isinstance(base_content[key], dict):
+                        # Shared read-only lesson data; merge into a private copy
+                        base_content[key] = thaw_lesson(base_content[key])
                     self._merge_content(base_content[key], value)
                 else:
                     base_content[key] = value
@@ -191,16 +247,18 @@ class ContentManager:
         # Always include custom lessons
         all_lessons.extend(self.custom_lessons.values())
         
+        # Match topics with one AND against each lesson's precomputed mask
+        # instead of scanning its topic list
+        topic_mask = self._topics_to_mask(topics) if topics else 0
+        
         # Apply filters
         filtered_lessons = []
         for lesson in all_lessons:
             if difficulty and lesson.get('difficulty') != difficulty:
                 continue
             
-            if topics:
-                lesson_topics = lesson.get('topics', [])
-                if not any(topic in lesson_topics for topic in topics):
-                    continue
+            if topics and not self._topic_masks.get(id(lesson), 0) & topic_mask:
+                continue
             
             # Create a summary with essential information
             summary = {
@@ -249,7 +307,7 @@ class ContentManager:
         
         xiangqi_path = os.path.join(output_dir, 'xiangqi_lessons.json')
         with open(xiangqi_path, 'w', encoding='utf-8') as f:
-            json.dump(self.xiangqi_lessons, f, indent=2, ensure_ascii=False)
+            json.dump(self.xiangqi_lessons, f, indent=2, ensure_ascii=False, default=_json_default)
         
         # Save custom lessons
         custom_dir = os.path.join(output_dir, 'custom')
@@ -309,6 +367,7 @@ class ContentManager:
         
         lesson_id = lesson['id']
         self.custom_lessons[lesson_id] = lesson
+        self._lessons_changed()
         
         # Save the lesson to file if we have a content directory
         if self.content_dir:
@@ -338,6 +397,7 @@ class ContentManager:
         lesson['id'] = lesson_id
         
         self.custom_lessons[lesson_id] = lesson
+        self._lessons_changed()
         
         # Save the updated lesson if we have a content directory
         if self.content_dir:
@@ -363,6 +423,7 @@ class ContentManager:
             return False
         
         del self.custom_lessons[lesson_id]
+        self._lessons_changed()
         
         # Remove the lesson file if we have a content directory
         if self.content_dir:
@@ -439,6 +500,10 @@ class ContentSystem:
         # Initialize components
         self.content_manager = ContentManager(os.path.join(self.base_dir))
         
+        # Learning paths by (game_type, difficulty), valid for one content version
+        self._learning_paths: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+        self._learning_paths_version = self.content_manager.content_version
+        
         # Import and initialize other components dynamically to avoid circular imports
         try:
             from content.history import HistoryManager
@@ -471,6 +536,27 @@ class ContentSystem:
         Returns:
             List of lesson summaries in recommended order
         """
+        # The lesson set only changes through the content manager, so a path
+        # stays valid until its content version moves on
+        version = self.content_manager.content_version
+        if version != self._learning_paths_version:
+            self._learning_paths.clear()
+            self._learning_paths_version = version
+        
+        key = (game_type, difficulty)
+        learning_path = self._learning_paths.get(key)
+        if learning_path is None:
+            learning_path = self._build_learning_path(game_type, difficulty)
+            self._learning_paths[key] = learning_path
+        
+        return list(learning_path)
+    
+    def _build_learning_path(
+        self,
+        game_type: str,
+        difficulty: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Compute the learning path for get_learning_path()."""
         # Get all lessons for the specified game type
         all_lessons = self.content_manager.list_lessons(game_type=game_type)
         
@@ -578,7 +664,7 @@ class ContentSystem:
         game_id: str,
         game_type: str,
         players: Dict[str, str],
-        moves: List[str],
+        moves: Sequence[str],
         result: str,
         metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
@@ -589,7 +675,7 @@ class ContentSystem:
             game_id: Unique identifier for the game
             game_type: Type of game ('chess' or 'xiangqi')
             players: Dictionary with player info (e.g., {'white': 'player1', 'black': 'player2'})
-            moves: List of moves in standard notation
+            moves: Sequence of moves in standard notation
             result: Game result (e.g., '1-0', '0-1', '1/2-1/2')
             metadata: Additional game information
             
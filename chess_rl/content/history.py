@@ -5,7 +5,7 @@ History module for storing and analyzing chess and xiangqi game history.
 import json
 import os
 import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Sequence, Union
 
 
 class GameHistory:
@@ -16,7 +16,7 @@ class GameHistory:
         game_id: str,
         game_type: str,
         players: Dict[str, str],
-        moves: List[str],
+        moves: Sequence[str],
         result: str,
         timestamp: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
@@ -28,7 +28,7 @@ class GameHistory:
             game_id: Unique identifier for the game
             game_type: Type of game ('chess' or 'xiangqi')
             players: Dictionary with player info (e.g., {'white': 'player1', 'black': 'player2'})
-            moves: List of moves in standard notation
+            moves: Sequence of moves in standard notation
             result: Game result (e.g., '1-0', '0-1', '1/2-1/2')
             timestamp: When the game was played (ISO format)
             metadata: Additional game information
@@ -40,6 +40,8 @@ class Question:
         self.game_type = game_type
         self.explanation = explanation or ""
         self.type = "base"
+        # An answer accepted by is_correct(); set by subclasses
+        self.correct_value: Any = None
     
     def is_correct(self, answer: Any) -> bool:
         """
@@ -131,6 +133,7 @@ class MultipleChoiceQuestion(Question):
             self.correct_option = correct_option
         else:
             self.correct_option = self.options.index(correct_option) if correct_option in self.options else 0
+        self.correct_value = self.correct_option
         
         self.type = "multiple_choice"
     
@@ -201,6 +204,7 @@ class TrueFalseQuestion(Question):
         """
         super().__init__(question_id, text, difficulty, category, game_type, explanation)
         self.correct_answer = correct_answer
+        self.correct_value = correct_answer
         self.type = "true_false"
     
     def is_correct(self, answer: Union[bool, str]) -> bool:
@@ -274,6 +278,7 @@ class BoardPositionQuestion(Question):
         super().__init__(question_id, text, difficulty, category, game_type, explanation)
         self.board_position = board_position
         self.correct_moves = correct_moves
+        self.correct_value = correct_moves[0] if correct_moves else None
         self.type = "board_position"
     
     def is_correct(self, answer: str) -> bool:
@@ -443,6 +448,33 @@ class QuizSession:
                 return is_correct
         return False
     
+    def answer_questions(self, answers: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Record answers to several questions at once.
+        
+        Args:
+            answers: Mapping of question ID to the user's answer
+            
+        Returns:
+            Mapping of question ID to whether the answer is correct.
+            Unknown question IDs are skipped.
+        """
+        questions = {q.question_id: q for q in self.quiz.questions}
+        timestamp = datetime.datetime.now().isoformat()
+        results = {}
+        for question_id, answer in answers.items():
+            question = questions.get(question_id)
+            if question is None:
+                continue
+            is_correct = question.is_correct(answer)
+            self.answers[question_id] = {
+                'answer': answer,
+                'is_correct': is_correct,
+                'timestamp': timestamp
+            }
+            results[question_id] = is_correct
+        return results
+    
     def complete(self) -> Dict[str, Any]:
         """
         Complete the quiz session and calculate the score.
@@ -506,6 +538,112 @@ class QuizSession:
         return session
 
 
+# Sample questions are static, so they are built once at import time and
+# shared by every sample quiz instead of being reconstructed per call.
+_CHESS_SAMPLE_QUESTIONS = (
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="Which piece can move in an L-shape?",
+        options=["King", "Queen", "Rook", "Knight"],
+        correct_option="Knight",
+        difficulty="beginner",
+        category="rules",
+        game_type="chess",
+        explanation="The Knight is the only chess piece that moves in an L-shape: two squares in one direction and then one square perpendicular to that direction."
+    ),
+    TrueFalseQuestion(
+        question_id=str(uuid.uuid4()),
+        text="A pawn can move two squares forward on its first move.",
+        correct_answer=True,
+        difficulty="beginner",
+        category="rules",
+        game_type="chess",
+        explanation="Pawns can move two squares forward from their starting position but only one square forward afterward."
+    ),
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="What is it called when the king is under attack?",
+        options=["Checkmate", "Check", "Stalemate", "Draw"],
+        correct_option="Check",
+        difficulty="beginner",
+        category="rules",
+        game_type="chess",
+        explanation="When the king is under attack, it is in 'check'. The player must move to eliminate the threat."
+    ),
+    BoardPositionQuestion(
+        question_id=str(uuid.uuid4()),
+        text="White to move. What is the best move to checkmate Black?",
+        board_position="r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 0 1",
+        correct_moves=["Qxf7#"],
+        difficulty="intermediate",
+        category="tactics",
+        game_type="chess",
+        explanation="Qxf7# is checkmate. The queen captures the f7 pawn with check, and the king has no legal moves."
+    ),
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="How many squares are on a standard chess board?",
+        options=["36", "49", "64", "81"],
+        correct_option="64",
+        difficulty="beginner",
+        category="basics",
+        game_type="chess",
+        explanation="A standard chess board has 8×8 = 64 squares."
+    )
+)
+
+_XIANGQI_SAMPLE_QUESTIONS = (
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="Which piece in Xiangqi must jump over exactly one piece to capture?",
+        options=["General", "Horse", "Chariot", "Cannon"],
+        correct_option="Cannon",
+        difficulty="beginner",
+        category="rules",
+        game_type="xiangqi",
+        explanation="The Cannon moves like a Chariot (Rook) but must jump over exactly one piece to capture."
+    ),
+    TrueFalseQuestion(
+        question_id=str(uuid.uuid4()),
+        text="The Elephant in Xiangqi can cross the river.",
+        correct_answer=False,
+        difficulty="beginner",
+        category="rules",
+        game_type="xiangqi",
+        explanation="The Elephant cannot cross the river, which limits its movement to its own side of the board."
+    ),
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="How many total intersection points are on a standard Xiangqi board?",
+        options=["64", "81", "90", "100"],
+        correct_option="90",
+        difficulty="beginner",
+        category="basics",
+        game_type="xiangqi",
+        explanation="A Xiangqi board has 9 files and 10 ranks, making 9×10 = 90 intersection points."
+    ),
+    TrueFalseQuestion(
+        question_id=str(uuid.uuid4()),
+        text="In Xiangqi, the Generals can face each other directly on the same file if there are no pieces between them.",
+        correct_answer=False,
+        difficulty="beginner",
+        category="rules",
+        game_type="xiangqi",
+        explanation="This is the 'flying general' rule. The two Generals cannot face each other directly on the same file with no pieces between them."
+    ),
+    MultipleChoiceQuestion(
+        question_id=str(uuid.uuid4()),
+        text="What happens to a Soldier in Xiangqi when it crosses the river?",
+        options=["It can move backward", "It can move horizontally", "It gets promoted", "It moves faster"],
+        correct_option="It can move horizontally",
+        difficulty="beginner",
+        category="rules",
+        game_type="xiangqi",
+        explanation="After crossing the river, a Soldier gains the ability to move horizontally in addition to moving forward."
+    )
+)
+
+
 class QuizManager:
     """Class to manage quizzes, including storage, retrieval, and session management."""
     
@@ -735,6 +873,34 @@ class QuizManager:
         
         return None
     
+    def answer_questions(self, session_id: str, answers: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Record answers to several questions in a session with a single save.
+        
+        Args:
+            session_id: The ID of the session
+            answers: Mapping of question ID to the user's answer
+            
+        Returns:
+            Mapping of question ID to answer feedback if successful, None otherwise
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return None
+        
+        results = session.answer_questions(answers)
+        self._save_session(session)
+        
+        questions = {q.question_id: q for q in session.quiz.questions}
+        return {
+            question_id: {
+                'is_correct': is_correct,
+                'feedback': questions[question_id].get_feedback(answers[question_id]),
+                'session_id': session_id
+            }
+            for question_id, is_correct in results.items()
+        }
+    
     def complete_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Complete a quiz session and calculate the results.
@@ -817,112 +983,11 @@ class QuizManager:
         if game_type == 'chess':
             title = "Chess Basics Quiz"
             description = "Test your knowledge of basic chess rules and concepts."
-            
-            questions = [
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="Which piece can move in an L-shape?",
-                    options=["King", "Queen", "Rook", "Knight"],
-                    correct_option="Knight",
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="chess",
-                    explanation="The Knight is the only chess piece that moves in an L-shape: two squares in one direction and then one square perpendicular to that direction."
-                ),
-                TrueFalseQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="A pawn can move two squares forward on its first move.",
-                    correct_answer=True,
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="chess",
-                    explanation="Pawns can move two squares forward from their starting position but only one square forward afterward."
-                ),
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="What is it called when the king is under attack?",
-                    options=["Checkmate", "Check", "Stalemate", "Draw"],
-                    correct_option="Check",
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="chess",
-                    explanation="When the king is under attack, it is in 'check'. The player must move to eliminate the threat."
-                ),
-                BoardPositionQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="White to move. What is the best move to checkmate Black?",
-                    board_position="r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 0 1",
-                    correct_moves=["Qxf7#"],
-                    difficulty="intermediate",
-                    category="tactics",
-                    game_type="chess",
-                    explanation="Qxf7# is checkmate. The queen captures the f7 pawn with check, and the king has no legal moves."
-                ),
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="How many squares are on a standard chess board?",
-                    options=["36", "49", "64", "81"],
-                    correct_option="64",
-                    difficulty="beginner",
-                    category="basics",
-                    game_type="chess",
-                    explanation="A standard chess board has 8×8 = 64 squares."
-                )
-            ]
+            questions = list(_CHESS_SAMPLE_QUESTIONS)
         else:  # xiangqi
             title = "Xiangqi Basics Quiz"
             description = "Test your knowledge of basic Xiangqi (Chinese Chess) rules and concepts."
-            
-            questions = [
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="Which piece in Xiangqi must jump over exactly one piece to capture?",
-                    options=["General", "Horse", "Chariot", "Cannon"],
-                    correct_option="Cannon",
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="xiangqi",
-                    explanation="The Cannon moves like a Chariot (Rook) but must jump over exactly one piece to capture."
-                ),
-                TrueFalseQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="The Elephant in Xiangqi can cross the river.",
-                    correct_answer=False,
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="xiangqi",
-                    explanation="The Elephant cannot cross the river, which limits its movement to its own side of the board."
-                ),
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="How many total intersection points are on a standard Xiangqi board?",
-                    options=["64", "81", "90", "100"],
-                    correct_option="90",
-                    difficulty="beginner",
-                    category="basics",
-                    game_type="xiangqi",
-                    explanation="A Xiangqi board has 9 files and 10 ranks, making 9×10 = 90 intersection points."
-                ),
-                TrueFalseQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="In Xiangqi, the Generals can face each other directly on the same file if there are no pieces between them.",
-                    correct_answer=False,
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="xiangqi",
-                    explanation="This is the 'flying general' rule. The two Generals cannot face each other directly on the same file with no pieces between them."
-                ),
-                MultipleChoiceQuestion(
-                    question_id=str(uuid.uuid4()),
-                    text="What happens to a Soldier in Xiangqi when it crosses the river?",
-                    options=["It can move backward", "It can move horizontally", "It gets promoted", "It moves faster"],
-                    correct_option="It can move horizontally",
-                    difficulty="beginner",
-                    category="rules",
-                    game_type="xiangqi",
-                    explanation="After crossing the river, a Soldier gains the ability to move horizontally in addition to moving forward."
-                )
-            ]
+            questions = list(_XIANGQI_SAMPLE_QUESTIONS)
         
         return self.create_quiz(
             title=title,
@@ -2,9 +2,11 @@
 Demo script showcasing the integrated content system with lessons, history, and quizzes.
 """
 
+import io
 import os
 import sys
 import json
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
 
 # Add parent directory to path
@@ -14,6 +16,18 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from content import ContentSystem
 
 
+@contextmanager
+def _buffered_stdout():
+    """Collect everything printed in the block and write it to stdout in one call."""
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
 def demo_content_management(content_system):
     """Demonstrate content management functionality."""
     print("\n===== CONTENT MANAGEMENT DEMO =====\n")
@@ -56,7 +70,8 @@ def demo_history_management(content_system):
     # Create and add a sample chess game
     game_id = f"demo-chess-{datetime.now().strftime('%Y%m%d%H%M%S')}"
     players = {"white": "Player1", "black": "Player2"}
-    moves = [
+    # Intern the SAN tokens so repeated moves share one string object
+    moves = tuple(sys.intern(m) for m in (
         "e4", "e5", 
         "Nf3", "Nc6", 
         "Bc4", "Nf6", 
@@ -72,7 +87,7 @@ def demo_history_management(content_system):
         "fxe5", "Ng4", 
         "d3", "Nxe5", 
         "dxe4", "Bd7"
-    ]
+    ))
     result = "1-0"
     metadata = {
         "event": "Demo Game",
@@ -140,14 +155,7 @@ def demo_quiz_management(content_system):
                     first_question = chess_quiz.questions[0]
                     
                     # Determine the correct answer for demo
-                    answer = None
-                    if hasattr(first_question, 'correct_option'):
-                        if isinstance(first_question.correct_option, int):
-                            answer = first_question.correct_option
-                        else:
-                            answer = first_question.correct_option
-                    elif hasattr(first_question, 'correct_answer'):
-                        answer = first_question.correct_answer
+                    answer = first_question.correct_value
                     
                     if answer is not None:
                         feedback = content_system.quiz_manager.answer_question(
@@ -195,9 +203,10 @@ def main():
     content_system = ContentSystem(temp_dir)
     
     # Run demos
-    demo_content_management(content_system)
-    demo_history_management(content_system)
-    demo_quiz_management(content_system)
+    # Each section is buffered and emitted once instead of line by line
+    for demo in (demo_content_management, demo_history_management, demo_quiz_management):
+        with _buffered_stdout():
+            demo(content_system)
     
     print("\n==================================================")
     print("                    DEMO COMPLETE                 ")
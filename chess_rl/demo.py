@@ -10,13 +10,18 @@ Usage (examples):
 import argparse
 import random
 
-from environments.chess_env import ChessEnv
-from environments.xiangqi_env import XiangqiEnv
-from game.xiangqi_pyffish_board import XiangqiPyffishBoard
+# Environment/board modules are imported inside each run_* function so a run
+# only pays for the game it actually plays (e.g. chess never loads pyffish).
 
 
 def run_chess_env(games: int, moves: int, seed: int | None, render: bool):
+    from environments.chess_env import ChessEnv
+
     env = ChessEnv()
+    # Bind hot lookups once; the loops below run for every step
+    step_fn = env.step
+    a2m = env.action_to_move
+    sample = env.sample_action
     for g in range(games):
         obs, info = env.reset(seed=seed)
         if render:
@@ -24,20 +29,24 @@ def run_chess_env(games: int, moves: int, seed: int | None, render: bool):
         done = truncated = False
         step = 0
         while not (done or truncated) and step < moves:
-            legal = info["legal_moves"]
-            if not legal:
+            if not info["num_legal_moves"]:
                 break
-            action = random.choice(legal)
-            obs, reward, done, truncated, info = env.step(action)
+            action = sample()
+            obs, reward, done, truncated, info = step_fn(action)
             step += 1
             if render:
-                print(f"Step {step}: {env.action_to_move(action)} | reward={reward}")
+                print(f"Step {step}: {a2m(action)} | reward={reward}")
                 env.render()
         print(f"Game {g+1} finished after {step} steps.")
 
 
 def run_xiangqi_env(games: int, moves: int, seed: int | None, auto: bool):
-    env = XiangqiEnv()
+    from environments.xiangqi_env import XiangqiEnv
+
+    env = XiangqiEnv(include_board_str=True)
+    step_fn = env.step
+    a2m = env.action_to_move
+    sample = env.sample_action
     for g in range(games):
         obs, info = env.reset(seed=seed)
         print("Initial board:")
@@ -45,14 +54,13 @@ def run_xiangqi_env(games: int, moves: int, seed: int | None, auto: bool):
         done = truncated = False
         step = 0
         while not (done or truncated) and step < moves:
-            legal_idx = info.get("legal_moves", [])
-            if not legal_idx:
+            if not info["num_legal_moves"]:
                 print("No legal moves. Stopping.")
                 break
-            action = random.choice(range(len(legal_idx)))
-            move = env.action_to_move(action)
+            action = sample()
+            move = a2m(action)
             print(f"Step {step+1}: {move}")
-            obs, reward, done, truncated, info = env.step(action)
+            obs, reward, done, truncated, info = step_fn(action)
             step += 1
             print(info.get("board_str", ""))
             if not auto:
@@ -61,16 +69,21 @@ def run_xiangqi_env(games: int, moves: int, seed: int | None, auto: bool):
 
 
 def run_xiangqi_pyffish(moves: int, auto: bool):
+    from game.xiangqi_pyffish_board import XiangqiPyffishBoard
+
     board = XiangqiPyffishBoard()
+    apply = board.apply_move
+    legal_fn = board.get_legal_moves
+    choice = random.choice
     print(board)
     for i in range(moves):
-        legal = board.get_legal_moves()
+        legal = legal_fn()
         if not legal:
             print("No legal moves. Stopping.")
             break
-        mv = random.choice(legal)
+        mv = choice(legal)
         print(f"Move {i+1}: {mv}")
-        reward, done = board.apply_move(mv)
+        reward, done = apply(mv)
         print(board)
         if done:
             print("Game over.")
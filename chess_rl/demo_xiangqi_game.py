@@ -3,17 +3,14 @@
 Demo trận đấu Xiangqi với hiển thị bàn cờ chi tiết và tương tác
 """
 
-import random
 from environments.xiangqi_env import XiangqiEnv
 from game.xiangqi_pyffish_board import XiangqiPyffishBoard, XiangqiPyffishMove
 
 
-def print_xiangqi_board_visual(board_str):
-    """Hiển thị bàn cờ Xiangqi một cách trực quan"""
+def format_xiangqi_board_visual(board_str):
+    """Dựng chuỗi hiển thị bàn cờ Xiangqi một cách trực quan"""
     
-    print("\n" + "="*50)
-    print("           BÀN CỜ XIANGQI")
-    print("="*50)
+    out = ["\n" + "="*50, "           BÀN CỜ XIANGQI", "="*50]
     
     # Hiển thị board string có sẵn với một số trang trí
     lines = board_str.strip().split('\n')
@@ -21,12 +18,18 @@ def print_xiangqi_board_visual(board_str):
         if line.strip():
             # Thêm viền cho board
             if any(c in line for c in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']):
-                print(f"   {line}")
+                out.append(f"   {line}")
             else:
-                print(f"     {line}")
+                out.append(f"     {line}")
     
-    print("\n   🔴 = Quân đỏ (Red)    ⚫ = Quân đen (Black)")
-    print("="*50)
+    out.append("\n   🔴 = Quân đỏ (Red)    ⚫ = Quân đen (Black)")
+    out.append("="*50)
+    return "\n".join(out)
+
+
+def print_xiangqi_board_visual(board_str):
+    """Hiển thị bàn cờ Xiangqi một cách trực quan"""
+    print(format_xiangqi_board_visual(board_str))
 
 
 def explain_move(move_str):
@@ -43,16 +46,52 @@ def explain_move(move_str):
     return f"Đi từ {from_col}{from_row} đến {to_col}{to_row}"
 
 
-def demo_xiangqi_game():
-    """Demo một trận đấu Xiangqi hoàn chỉnh"""
+def _simulate(env, n, rng):
+    """
+    Chơi tối đa n nước ngẫu nhiên, không in gì ra terminal.
+    
+    Args:
+        env: XiangqiEnv đã được reset
+        n: Số nước tối đa
+        rng: np.random.Generator dùng để chọn nước
+        
+    Returns:
+        Danh sách (move_str, reward, terminated, truncated, info) cho từng nước;
+        ngắn hơn n nếu ván kết thúc hoặc không còn nước đi hợp lệ
+    """
+    trace = []
+    step_fn = env.step
+    sample = env.sample_action
+    a2m = env.action_to_move
+    for _ in range(n):
+        try:
+            action = sample(rng)
+        except ValueError:
+            break  # Không còn nước đi hợp lệ
+        move_str = str(a2m(action))
+        _, reward, terminated, truncated, info = step_fn(action)
+        trace.append((move_str, reward, terminated, truncated, info))
+        if terminated or truncated:
+            break
+    return trace
+
+
+def demo_xiangqi_game(steps_per_prompt=5):
+    """
+    Demo một trận đấu Xiangqi hoàn chỉnh
+    
+    Args:
+        steps_per_prompt: Số bước chơi liền giữa hai lần nhấn Enter
+    """
     
     print("\n" + "🎯"*20)
     print("      DEMO TRẬN ĐẤU XIANGQI")
     print("🎯"*20)
     
     # Khởi tạo môi trường Xiangqi
-    env = XiangqiEnv()
+    env = XiangqiEnv(include_board_str=True)
     observation, info = env.reset()
+    rng = env.rng
     
     # Hiển thị bàn cờ ban đầu
     print("\n📍 VỊ TRÍ BAN ĐẦU:")
@@ -60,39 +99,32 @@ def demo_xiangqi_game():
     print_xiangqi_board_visual(board_str)
     
     print(f"\n🎮 Lượt đi: {'Đỏ (Red)' if info['turn'] == 'red' else 'Đen (Black)'}")
-    print(f"📊 Số nước đi hợp lệ: {len(info['legal_moves'])}")
+    print(f"📊 Số nước đi hợp lệ: {info['num_legal_moves']}")
     
     step = 0
     max_steps = 20  # Giới hạn số bước để demo
+    terminated = truncated = False
     
     while step < max_steps:
-        step += 1
-        
-        # Lấy danh sách nước đi hợp lệ
-        legal_moves = info["legal_moves"]
-        if not legal_moves:
+        # Chơi một đoạn nước đi, rồi mới in kết quả
+        chunk = _simulate(env, min(steps_per_prompt, max_steps - step), rng)
+        if not chunk:
             print("\n🏁 Không còn nước đi hợp lệ! Ván cờ kết thúc.")
             break
         
-        # Chọn một nước đi ngẫu nhiên
-        action = random.choice(range(len(legal_moves)))
-        
-        # Thực hiện nước đi
-        observation, reward, terminated, truncated, info = env.step(action)
-        
-        # Lấy thông tin nước đi
-        move = env.action_to_move(action)
-        move_str = str(move)
-        
-        print(f"\n🔄 BƯỚC {step}")
-        print(f"👉 Nước đi: {move_str} ({explain_move(move_str)})")
-        print(f"🎯 Lượt: {'Đỏ (Red)' if step % 2 == 1 else 'Đen (Black)'}")
-        
-        # Hiển thị bàn cờ sau nước đi
-        print_xiangqi_board_visual(info["board_str"])
-        
-        print(f"🏆 Phần thưởng: {reward}")
-        print(f"📊 Nước đi tiếp theo: {len(info.get('legal_moves', []))} khả năng")
+        lines = []
+        for move_str, reward, terminated, truncated, info in chunk:
+            step += 1
+            lines += [
+                f"\n🔄 BƯỚC {step}",
+                f"👉 Nước đi: {move_str} ({explain_move(move_str)})",
+                f"🎯 Lượt: {'Đỏ (Red)' if step % 2 == 1 else 'Đen (Black)'}",
+                # Bàn cờ sau nước đi
+                format_xiangqi_board_visual(info["board_str"]),
+                f"🏆 Phần thưởng: {reward}",
+                f"📊 Nước đi tiếp theo: {info['num_legal_moves']} khả năng",
+            ]
+        print("\n".join(lines))
         
         if terminated:
             print(f"\n🎉 GAME OVER! Kết quả: {info.get('result', 'Không xác định')}")
@@ -118,7 +150,7 @@ def demo_xiangqi_environment():
     print("🔧"*20)
     
     # Khởi tạo environment
-    env = XiangqiEnv()
+    env = XiangqiEnv(include_board_str=True)
     print("✅ Đã khởi tạo XiangqiEnv")
     
     # Reset environment
@@ -127,21 +159,21 @@ def demo_xiangqi_environment():
     print(f"📊 Observation shape: {obs.shape}")
     print(f"🎯 Turn: {info['turn']}")
     print(f"📝 Board: Available")
-    print(f"🔢 Legal moves: {len(info['legal_moves'])}")
+    print(f"🔢 Legal moves: {info['num_legal_moves']}")
     
     # Thử một vài nước đi
     print(f"\n🎮 Thử 3 nước đi ngẫu nhiên:")
     
     for i in range(3):
-        legal_moves = info["legal_moves"]
-        if not legal_moves:
+        num_legal = info["num_legal_moves"]
+        if not num_legal:
             break
             
-        action = random.choice(range(len(legal_moves)))
+        action = int(env.rng.integers(num_legal))
         obs, reward, done, truncated, info = env.step(action)
         
         print(f"  Bước {i+1}: Action {action}, Reward {reward}, Done {done}")
-        print(f"          Legal moves: {len(info.get('legal_moves', []))}")
+        print(f"          Legal moves: {info['num_legal_moves']}")
         
         if done or truncated:
             break
@@ -7,19 +7,17 @@ import random
 from game.xiangqi_pyffish_board import XiangqiPyffishBoard, XiangqiPyffishMove
 
 
-def print_simple_board(fen):
-    """Hiển thị bàn cờ từ FEN string"""
-    print("\n" + "="*60)
-    print("                BÀN CỜ XIANGQI")
-    print("="*60)
+def format_simple_board(fen):
+    """Dựng chuỗi hiển thị bàn cờ từ FEN string"""
+    lines = ["\n" + "="*60, "                BÀN CỜ XIANGQI", "="*60]
     
     # Parse FEN
     parts = fen.split(' ')
     board_fen = parts[0]
     turn = parts[1]
     
-    print("   a b c d e f g h i")
-    print("  " + "-"*19)
+    lines.append("   a b c d e f g h i")
+    lines.append("  " + "-"*19)
     
     rows = board_fen.split('/')
     for i, row in enumerate(rows):
@@ -34,24 +32,66 @@ def print_simple_board(fen):
                 line += f" {char}"
         
         line += f" |{rank}"
-        print(line)
+        lines.append(line)
         
         # Đường sông ở giữa
         if i == 4:
-            print("  |" + "-"*17 + "|")
-            print("  |   SÔNG HÀN GIỚI   |")
-            print("  |" + "-"*17 + "|")
+            lines.append("  |" + "-"*17 + "|")
+            lines.append("  |   SÔNG HÀN GIỚI   |")
+            lines.append("  |" + "-"*17 + "|")
     
-    print("  " + "-"*19)
-    print("   a b c d e f g h i")
+    lines.append("  " + "-"*19)
+    lines.append("   a b c d e f g h i")
     
     turn_text = "🔴 Đỏ (RED)" if turn == 'w' else "⚫ Đen (BLACK)"
-    print(f"\n   Lượt đi: {turn_text}")
-    print("="*60)
+    lines.append(f"\n   Lượt đi: {turn_text}")
+    lines.append("="*60)
+    return "\n".join(lines)
+
+
+def print_simple_board(fen):
+    """Hiển thị bàn cờ từ FEN string"""
+    print(format_simple_board(fen))
+
+
+def _simulate(board, n, rng):
+    """
+    Chơi tối đa n nước ngẫu nhiên trên board, không in gì ra terminal.
+    
+    Args:
+        board: XiangqiPyffishBoard
+        n: Số nước tối đa
+        rng: random.Random dùng để chọn nước
+        
+    Returns:
+        (trace, error): trace là danh sách (move_str, reward, done, fen) cho
+        từng nước, ngắn hơn n nếu ván kết thúc, hết nước đi hợp lệ hoặc áp
+        dụng nước đi bị lỗi; error là exception khi áp dụng nước đi, hoặc None
+    """
+    trace = []
+    apply = board.apply_move_unchecked  # Nước đi lấy từ get_legal_moves nên luôn hợp lệ
+    for _ in range(n):
+        moves = board.get_legal_moves()
+        if not moves:
+            break
+        move = moves[rng.randrange(len(moves))]
+        try:
+            reward, done = apply(move)
+        except Exception as e:
+            return trace, e
+        trace.append((move.move_str, reward, done, board.current_fen))
+        if done:
+            break
+    return trace, None
 
 
-def demo_xiangqi_simple():
-    """Demo Xiangqi đơn giản với PyFFish"""
+def demo_xiangqi_simple(moves_per_prompt=5):
+    """
+    Demo Xiangqi đơn giản với PyFFish
+    
+    Args:
+        moves_per_prompt: Số nước chơi liền giữa hai lần nhấn Enter
+    """
     
     print("🎮 DEMO XIANGQI - TRẬN ĐẤU MẪU")
     print("="*50)
@@ -79,45 +119,43 @@ def demo_xiangqi_simple():
         input("\nNhấn Enter để bắt đầu...")
         
         # Chơi một số nước
+        rng = random.Random()
         moves_played = 0
         max_moves = 10
         
         while moves_played < max_moves:
-            # Lấy nước đi hợp lệ hiện tại
-            current_moves = board.get_legal_moves()
-            if not current_moves:
+            # Chơi cả đoạn nước đi trước, in kết quả một lần sau
+            chunk, error = _simulate(board, min(moves_per_prompt, max_moves - moves_played), rng)
+            
+            lines = []
+            for move_str, reward, done, fen in chunk:
+                moves_played += 1
+                lines += [
+                    f"\n🔄 NƯỚC {moves_played}",
+                    f"👉 Nước đi: {move_str}",
+                    f"💯 Phần thưởng: {reward}",
+                    f"🏆 Trạng thái: {'Kết thúc' if done else 'Tiếp tục'}",
+                    # Bàn cờ sau nước đi
+                    format_simple_board(fen),
+                ]
+            if lines:
+                print("\n".join(lines))
+            
+            if error is not None:
+                print(f"❌ Lỗi khi thực hiện nước đi: {error}")
+                break
+            if not chunk:
                 print("🏁 Không còn nước đi hợp lệ! Trận đấu kết thúc.")
                 break
+            _, _, done, _ = chunk[-1]
+            if done:
+                print("🎉 TRẬN ĐẤU KẾT THÚC!")
+                break
             
-            # Chọn nước đi ngẫu nhiên
-            move = random.choice(current_moves)
-            
-            print(f"\n🔄 NƯỚC {moves_played + 1}")
-            print(f"👉 Nước đi: {move.move_str}")
+            print(f"📊 Nước đi tiếp theo: {len(board.get_legal_moves())} khả năng")
             
-            # Thực hiện nước đi
-            try:
-                reward, done = board.apply_move(move)
-                moves_played += 1
-                
-                print(f"💯 Phần thưởng: {reward}")
-                print(f"🏆 Trạng thái: {'Kết thúc' if done else 'Tiếp tục'}")
-                
-                # Hiển thị bàn cờ sau nước đi
-                print_simple_board(board.current_fen)
-                
-                if done:
-                    print("🎉 TRẬN ĐẤU KẾT THÚC!")
-                    break
-                
-                print(f"📊 Nước đi tiếp theo: {len(board.get_legal_moves())} khả năng")
-                
-                # Tạm dừng để xem
-                input("Nhấn Enter để tiếp tục...")
-                
-            except Exception as e:
-                print(f"❌ Lỗi khi thực hiện nước đi: {e}")
-                break
+            # Tạm dừng để xem
+            input("Nhấn Enter để tiếp tục...")
         
         print(f"\n🏁 DEMO HOÀN TẤT!")
         print(f"📈 Tổng số nước đã đi: {moves_played}")
@@ -0,0 +1,30 @@
+"""
+Scatter kernels used to build dense action masks.
+
+When numba is installed the scatter runs as a compiled loop; otherwise it
+falls back to a single NumPy fancy-index store. Both take plain integer
+arrays only, never board or move objects.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _scatter_mask_numpy(from_idx: np.ndarray, to_idx: np.ndarray, stride: int, mask: np.ndarray) -> None:
+    """Set ``mask[from_idx * stride + to_idx] = 1`` with one vectorized store."""
+    mask[from_idx * stride + to_idx] = 1
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _scatter_mask_numba(from_idx, to_idx, stride, mask):
+        for i in range(from_idx.shape[0]):
+            mask[from_idx[i] * stride + to_idx[i]] = 1
+
+    scatter_mask = _scatter_mask_numba
+else:
+    scatter_mask = _scatter_mask_numpy
@@ -2,10 +2,46 @@
 Base Environment module for RL environments
 """
 
+import warnings
 from typing import Tuple, Dict, Any, Optional
 import numpy as np
 from abc import ABC, abstractmethod
 
+# Generator shared by every env that is not given its own rng or seed,
+# so vectorized envs do not each carry a separate generator state
+SHARED_RNG = np.random.default_rng()
+
+
+class StepInfo(dict):
+    """
+    Info dict returned by ``reset()`` and ``step()``.
+    
+    The legal moves are reported as a count under ``num_legal_moves``; the
+    action indices are simply ``range(num_legal_moves)``. The old
+    ``legal_moves`` key is no longer stored: reading it emits a
+    DeprecationWarning and builds the index list on the fly.
+    """
+    
+    def __missing__(self, key: str) -> Any:
+        if key == "legal_moves" and "num_legal_moves" in self:
+            return self._legal_move_indices(stacklevel=3)
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        if key == "legal_moves" and "num_legal_moves" in self:
+            return self._legal_move_indices(stacklevel=3)
+        return default
+    
+    def _legal_move_indices(self, stacklevel: int) -> list:
+        warnings.warn(
+            'info["legal_moves"] is deprecated; use range(info["num_legal_moves"])',
+            DeprecationWarning,
+            stacklevel=stacklevel
+        )
+        return list(range(self["num_legal_moves"]))
+
 
 class BaseEnv(ABC):
     """
@@ -2,11 +2,11 @@
 Chess Environment module - Gym-compatible chess environment
 """
 
-import random
 import numpy as np
 import chess
 from typing import Tuple, Dict, Any, List, Optional, Union
-from environments.base_env import BaseEnv
+from environments.base_env import BaseEnv, StepInfo, SHARED_RNG
+from environments._mask_kernels import scatter_mask
 from game.chess_board import ChessBoard
 from game.move import Move
 
@@ -17,23 +17,53 @@ class ChessEnv(BaseEnv):
     
     This class wraps a ChessBoard and provides conversion between
     move indices and Move objects.
+    
+    The observation and the ``action_mask`` in the info dict are buffers
+    owned by the env and overwritten on every reset/step; copy them if they
+    must outlive the step.
+    The info dict carries an integer ``state_hash`` of the position; the
+    ``fen`` is only added when ``include_fen`` is set or the game has ended.
     """
     
     # Default settings
     DEFAULT_MAX_STEPS = 400  # Maximum steps before episode truncation
     
-    def __init__(self, max_steps: int = DEFAULT_MAX_STEPS):
+    # Keys present in every info dict; copied and filled in by _build_info
+    _INFO_TEMPLATE = {"num_legal_moves": 0, "action_mask": None, "turn": "white", "state_hash": 0}
+    
+    def __init__(
+        self,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        include_fen: bool = False,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize the chess environment.
         
         Args:
             max_steps: Maximum number of steps per episode
+            include_fen: Add the FEN of the position to every info dict
+            rng: Random generator for sampling actions; defaults to the
+                generator shared by all envs until ``seed()`` is called
         """
         self.board = ChessBoard()
         self.max_steps = max_steps
+        self.include_fen = include_fen
         self.steps = 0
-        self.current_player = chess.WHITE  # White starts
-        self.rng = random.Random()
+        self.rng = rng if rng is not None else SHARED_RNG
+        # move -> action index for the board's current legal move list,
+        # built lazily by move_to_action
+        self._move_index_src = None
+        self._move_index = {}
+        # Reused by reset/step to avoid allocating an observation every step
+        self._obs_buffer = np.zeros((ChessBoard.NUM_PLANES, ChessBoard.BOARD_SIZE, ChessBoard.BOARD_SIZE), dtype=np.float32)
+        # Reused by _get_action_mask to avoid allocating a mask every step
+        self._mask_buffer = np.zeros(4096, dtype=np.int8)
+    
+    @property
+    def current_player(self) -> bool:
+        """Color to move (chess.WHITE or chess.BLACK), read from the board."""
+        return self.board.board.turn
     
     def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
@@ -53,17 +83,13 @@ class ChessEnv(BaseEnv):
         # Reset board
         self.board.reset()
         self.steps = 0
-        self.current_player = chess.WHITE
         
         # Return initial observation and info
-        info = {
-            "legal_moves": self._get_legal_move_indices(),
-            "action_mask": self._get_action_mask(),
-            "turn": "white",
-            "fen": self.board.board.fen()
-        }
+        info = self._build_info()
+        if self.include_fen:
+            info["fen"] = self.board.get_fen()
         
-        return self.board.to_observation(), info
+        return self.board.to_observation(out=self._obs_buffer), info
     
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
         """
@@ -80,7 +106,7 @@ class ChessEnv(BaseEnv):
             info: Additional information
         """
         # Convert action index to Move
-        legal_moves = list(self.board.get_legal_moves())
+        legal_moves = self._legal_moves()
         if action >= len(legal_moves):
             raise ValueError(f"Invalid action index: {action}. Only {len(legal_moves)} legal moves.")
         
@@ -90,26 +116,21 @@ class ChessEnv(BaseEnv):
         reward, game_over = self.board.apply_move(move)
         self.steps += 1
         
-        # Switch player
-        self.current_player = not self.current_player
-        
         # Check for termination
         terminated = game_over
         truncated = self.steps >= self.max_steps
         
         # Build info dict
-        info = {
-            "legal_moves": self._get_legal_move_indices(),
-            "action_mask": self._get_action_mask(),
-            "turn": "white" if self.board.board.turn else "black",
-            "fen": self.board.board.fen()
-        }
+        info = self._build_info()
+        
+        if self.include_fen or terminated:
+            info["fen"] = self.board.get_fen()
         
         if terminated:
             result = self.board.get_result()
             info["result"] = result
         
-        return self.board.to_observation(), reward, terminated, truncated, info
+        return self.board.to_observation(out=self._obs_buffer), reward, terminated, truncated, info
     
     def render(self, mode: str = "human") -> Optional[np.ndarray]:
         """
@@ -145,16 +166,62 @@ class ChessEnv(BaseEnv):
         Args:
             seed: The random seed to use
         """
-        self.rng = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+    
+    def sample_action(self, rng: Optional[np.random.Generator] = None) -> int:
+        """
+        Sample a uniformly random legal action index.
+        
+        Reuses the cached legal moves of the current position.
+        
+        Args:
+            rng: Random generator to draw from; defaults to the env's own rng
+            
+        Returns:
+            Action index
+            
+        Raises:
+            ValueError: If there are no legal moves
+        """
+        num_legal = len(self._legal_moves())
+        if num_legal == 0:
+            raise ValueError("No legal moves in current position")
+        return int((rng or self.rng).integers(num_legal))
+    
+    def _build_info(self) -> StepInfo:
+        """
+        Build the info dict for the current position.
+        
+        Returns:
+            StepInfo with the keys of _INFO_TEMPLATE filled in
+        """
+        info = StepInfo(self._INFO_TEMPLATE)
+        info["num_legal_moves"] = len(self._legal_moves())
+        info["action_mask"] = self._get_action_mask()
+        info["turn"] = "white" if self.board.board.turn else "black"
+        info["state_hash"] = self._state_hash()
+        return info
     
-    def _get_legal_move_indices(self) -> List[int]:
+    def _state_hash(self) -> int:
         """
-        Return indices corresponding to legal moves.
+        Return an integer key of the current position.
         
         Returns:
-            List of valid action indices
+            Position hash (see ChessBoard.get_state_hash)
         """
-        return list(range(len(self.board.get_legal_moves())))
+        return self.board.get_state_hash()
+    
+    def _legal_moves(self) -> List[chess.Move]:
+        """
+        Return the legal moves of the current position.
+        
+        The board computes them once per position, so every helper in a
+        step shares one move generation pass.
+        
+        Returns:
+            List of legal moves (shared; do not mutate)
+        """
+        return self.board.get_legal_move_tensor()[0]
     
     def _get_action_mask(self) -> np.ndarray:
         """
@@ -162,17 +229,15 @@ class ChessEnv(BaseEnv):
         
         Returns:
             Binary array of shape (4096,) where 1 indicates a legal move
+            (the env's reused mask buffer)
         """
         # Chess has a maximum of 64*64 = 4096 possible moves (all squares to all squares)
-        mask = np.zeros(4096, dtype=np.int8)
-        legal_moves = self.board.get_legal_moves()
+        mask = self._mask_buffer
+        mask.fill(0)
+        _, from_sq, to_sq = self.board.get_legal_move_tensor()
         
-        for move in legal_moves:
-            # Convert move to index in 4096 space
-            from_sq = move.from_square
-            to_sq = move.to_square
-            move_idx = from_sq * 64 + to_sq
-            mask[move_idx] = 1
+        # Convert moves to indices in 4096 space and scatter them into the mask
+        scatter_mask(from_sq, to_sq, 64, mask)
         
         return mask
     
@@ -194,11 +259,16 @@ class ChessEnv(BaseEnv):
         elif isinstance(move, Move):
             move = chess.Move(move.from_sq, move.to_sq, move.promotion)
         
-        legal_moves = list(self.board.get_legal_moves())
+        legal_moves = self._legal_moves()
+        # The board hands out the same list until the position changes
+        if legal_moves is not self._move_index_src:
+            self._move_index = {legal_move: i for i, legal_move in enumerate(legal_moves)}
+            self._move_index_src = legal_moves
+        
         try:
-            return legal_moves.index(move)
-        except ValueError:
-            raise ValueError(f"Move {move} is not legal in current position")
+            return self._move_index[move]
+        except KeyError:
+            raise ValueError(f"Move {move} is not legal in current position") from None
     
     def action_to_move(self, action: int) -> chess.Move:
         """
@@ -213,7 +283,7 @@ class ChessEnv(BaseEnv):
         Raises:
             ValueError: If the action index is invalid
         """
-        legal_moves = list(self.board.get_legal_moves())
+        legal_moves = self._legal_moves()
         if action >= len(legal_moves):
             raise ValueError(f"Invalid action index: {action}. Only {len(legal_moves)} legal moves.")
         
@@ -2,12 +2,34 @@
 Xiangqi Environment module - Gym-compatible Chinese chess environment
 """
 
-import random
 import numpy as np
 from typing import Tuple, Dict, Any, List, Optional
-from environments.base_env import BaseEnv
+from environments.base_env import BaseEnv, StepInfo, SHARED_RNG
+from environments._mask_kernels import scatter_mask
 from game.xiangqi_board import XiangqiBoard, XiangqiMove, RED, BLACK
 
+# Số ô trên bàn cờ (9x10) và kích thước không gian hành động dạng dense
+NUM_SQUARES = 90
+ACTION_SPACE_SIZE = NUM_SQUARES * NUM_SQUARES
+
+
+def sparse_to_dense(mask: np.ndarray, size: int = ACTION_SPACE_SIZE) -> np.ndarray:
+    """
+    Convert a sparse action mask to the dense binary form.
+    
+    Args:
+        mask: Array of shape (N, 2) with (from_idx, to_idx) flat square pairs
+        size: Length of the dense mask
+        
+    Returns:
+        Binary int8 array of shape (size,) where 1 indicates a legal move
+    """
+    dense = np.zeros(size, dtype=np.int8)
+    if len(mask):
+        mask = np.asarray(mask, dtype=np.int32)
+        dense[mask[:, 0] * NUM_SQUARES + mask[:, 1]] = 1
+    return dense
+
 
 class XiangqiEnv(BaseEnv):
     """
@@ -15,23 +37,59 @@ class XiangqiEnv(BaseEnv):
     
     This class wraps a XiangqiBoard and provides conversion between
     move indices and XiangqiMove objects.
+    
+    The observation and the ``action_mask`` in the info dict are buffers
+    owned by the env and overwritten on every reset/step; copy them if they
+    must outlive the step.
+    With ``sparse_action_mask=True`` it is instead a fresh (N, 2) int16 array
+    of (from_idx, to_idx) pairs; see ``sparse_to_dense``. The printable
+    ``board_str`` is only added when ``include_board_str`` is set or the game
+    has ended; use ``render()`` to view the board on demand.
     """
     
     # Default settings
     DEFAULT_MAX_STEPS = 400  # Maximum steps before episode truncation
     
-    def __init__(self, max_steps: int = DEFAULT_MAX_STEPS):
+    # Keys present in every info dict; copied and filled in by _build_info
+    _INFO_TEMPLATE = {"num_legal_moves": 0, "action_mask": None, "turn": "red"}
+    
+    def __init__(
+        self,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        sparse_action_mask: bool = False,
+        include_board_str: bool = False,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize the Xiangqi environment.
         
         Args:
             max_steps: Maximum number of steps per episode
+            sparse_action_mask: Return action masks as (N, 2) arrays of
+                (from_idx, to_idx) instead of a dense 8100-entry array
+            include_board_str: Add the printable board to every info dict
+            rng: Random generator for sampling actions; defaults to the
+                generator shared by all envs until ``seed()`` is called
         """
         self.board = XiangqiBoard()
         self.max_steps = max_steps
+        self.sparse_action_mask = sparse_action_mask
+        self.include_board_str = include_board_str
         self.steps = 0
-        self.current_player = RED  # Red starts
-        self.rng = random.Random()
+        self.rng = rng if rng is not None else SHARED_RNG
+        # move -> action index for the board's current legal move list,
+        # built lazily by move_to_action
+        self._move_index_src = None
+        self._move_index = {}
+        # Reused by reset/step to avoid allocating an observation every step
+        self._obs_buffer = np.zeros((XiangqiBoard.NUM_PLANES, XiangqiBoard.BOARD_HEIGHT, XiangqiBoard.BOARD_WIDTH), dtype=np.float32)
+        # Reused by _get_action_mask to avoid allocating a mask every step
+        self._mask_buffer = np.zeros(ACTION_SPACE_SIZE, dtype=np.int8)
+    
+    @property
+    def current_player(self) -> bool:
+        """Color to move (RED or BLACK), read from the board."""
+        return self.board.current_player
     
     def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
@@ -51,17 +109,13 @@ class XiangqiEnv(BaseEnv):
         # Reset board
         self.board.reset()
         self.steps = 0
-        self.current_player = RED
         
         # Return initial observation and info
-        info = {
-            "legal_moves": self._get_legal_move_indices(),
-            "action_mask": self._get_action_mask(),
-            "turn": "red",
-            "board_str": str(self.board)
-        }
+        info = self._build_info()
+        if self.include_board_str:
+            info["board_str"] = str(self.board)
         
-        return self.board.to_observation(), info
+        return self.board.to_observation(out=self._obs_buffer), info
     
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
         """
@@ -78,7 +132,7 @@ class XiangqiEnv(BaseEnv):
             info: Additional information
         """
         # Convert action index to XiangqiMove
-        legal_moves = self.board.get_legal_moves()
+        legal_moves = self._legal_moves()
         if action >= len(legal_moves):
             raise ValueError(f"Invalid action index: {action}. Only {len(legal_moves)} legal moves.")
         
@@ -88,26 +142,21 @@ class XiangqiEnv(BaseEnv):
         reward, game_over = self.board.apply_move(move)
         self.steps += 1
         
-        # Switch player
-        self.current_player = not self.current_player
-        
         # Check for termination
         terminated = game_over
         truncated = self.steps >= self.max_steps
         
         # Build info dict
-        info = {
-            "legal_moves": self._get_legal_move_indices(),
-            "action_mask": self._get_action_mask(),
-            "turn": "red" if self.board.current_player == RED else "black",
-            "board_str": str(self.board)
-        }
+        info = self._build_info()
+        
+        if self.include_board_str or terminated:
+            info["board_str"] = str(self.board)
         
         if terminated:
             result = self.board.get_result()
             info["result"] = result
         
-        return self.board.to_observation(), reward, terminated, truncated, info
+        return self.board.to_observation(out=self._obs_buffer), reward, terminated, truncated, info
     
     def render(self, mode: str = "human") -> Optional[np.ndarray]:
         """
@@ -142,35 +191,68 @@ class XiangqiEnv(BaseEnv):
         Args:
             seed: The random seed to use
         """
-        self.rng = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+    
+    def sample_action(self, rng: Optional[np.random.Generator] = None) -> int:
+        """
+        Sample a uniformly random legal action index.
+        
+        Args:
+            rng: Random generator to draw from; defaults to the env's own rng
+            
+        Returns:
+            Action index
+            
+        Raises:
+            ValueError: If there are no legal moves
+        """
+        num_legal = len(self._legal_moves())
+        if num_legal == 0:
+            raise ValueError("No legal moves in current position")
+        return int((rng or self.rng).integers(num_legal))
     
-    def _get_legal_move_indices(self) -> List[int]:
+    def _build_info(self) -> StepInfo:
         """
-        Return indices corresponding to legal moves.
+        Build the info dict for the current position.
         
         Returns:
-            List of valid action indices
+            StepInfo with the keys of _INFO_TEMPLATE filled in
         """
-        return list(range(len(self.board.get_legal_moves())))
+        info = StepInfo(self._INFO_TEMPLATE)
+        info["num_legal_moves"] = len(self._legal_moves())
+        info["action_mask"] = self._get_action_mask()
+        info["turn"] = "red" if self.board.current_player == RED else "black"
+        return info
     
-    def _get_action_mask(self) -> np.ndarray:
+    def _legal_moves(self) -> List[XiangqiMove]:
         """
-        Generate a binary mask for valid actions.
+        Return the legal moves of the current position.
+        
+        The board computes them once per position, so every helper in a
+        step shares one move generation pass.
         
         Returns:
-            Binary array where 1 indicates a legal move
+            List of legal moves (shared; do not mutate)
         """
-        # Xiangqi có tối đa 90*90 = 8100 nước đi có thể (9x10 bàn cờ)
-        mask = np.zeros(8100, dtype=np.int8)
-        legal_moves = self.board.get_legal_moves()
+        return self.board.get_legal_move_tensor()[0]
+    
+    def _get_action_mask(self) -> np.ndarray:
+        """
+        Generate a mask for valid actions.
         
-        for i, move in enumerate(legal_moves):
-            # Chuyển đổi từ vị trí (row, col) sang index phẳng
-            from_idx = move.from_pos[0] * self.board.BOARD_WIDTH + move.from_pos[1]
-            to_idx = move.to_pos[0] * self.board.BOARD_WIDTH + move.to_pos[1]
-            move_idx = from_idx * 90 + to_idx  # 90 = 9 * 10 (kích thước bàn cờ)
-            mask[move_idx] = 1
+        Returns:
+            Binary array where 1 indicates a legal move (the env's reused
+            mask buffer), or an (N, 2) int16 array of (from_idx, to_idx)
+            pairs if ``sparse_action_mask`` is set
+        """
+        _, from_idx, to_idx = self.board.get_legal_move_tensor()
+        if self.sparse_action_mask:
+            return np.stack((from_idx, to_idx), axis=1).astype(np.int16)
         
+        # Xiangqi có tối đa 90*90 = 8100 nước đi có thể (9x10 bàn cờ)
+        mask = self._mask_buffer
+        mask.fill(0)
+        scatter_mask(from_idx, to_idx, NUM_SQUARES, mask)
         return mask
     
     def move_to_action(self, move: XiangqiMove) -> int:
@@ -186,11 +268,16 @@ class XiangqiEnv(BaseEnv):
         Raises:
             ValueError: If the move is not legal
         """
-        legal_moves = self.board.get_legal_moves()
+        legal_moves = self._legal_moves()
+        # The board hands out the same list until the position changes
+        if legal_moves is not self._move_index_src:
+            self._move_index = {legal_move: i for i, legal_move in enumerate(legal_moves)}
+            self._move_index_src = legal_moves
+        
         try:
-            return legal_moves.index(move)
-        except ValueError:
-            raise ValueError(f"Move {move} is not legal in current position")
+            return self._move_index[move]
+        except KeyError:
+            raise ValueError(f"Move {move} is not legal in current position") from None
     
     def action_to_move(self, action: int) -> XiangqiMove:
         """
@@ -205,7 +292,7 @@ class XiangqiEnv(BaseEnv):
         Raises:
             ValueError: If the action index is invalid
         """
-        legal_moves = self.board.get_legal_moves()
+        legal_moves = self._legal_moves()
         if action >= len(legal_moves):
             raise ValueError(f"Invalid action index: {action}. Only {len(legal_moves)} legal moves.")
         
@@ -2,16 +2,13 @@
 Test additional functions of pyffish API
 """
 
-try:
-    import pyffish as sf
-    has_pyffish = True
-except ImportError:
-    has_pyffish = False
-    print("pyffish not installed. Please install with: pip install pyffish")
-
 def explore_pyffish_api():
     """Explore the full API of pyffish."""
-    if not has_pyffish:
+    # Imported here so that importing this module has no side effects
+    try:
+        import pyffish as sf
+    except ImportError:
+        print("pyffish not installed. Please install with: pip install pyffish")
         return
     
     print("=== Exploring pyffish API ===")
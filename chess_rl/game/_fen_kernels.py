@@ -0,0 +1,84 @@
+"""
+Kernels that turn the board part of a FEN string into piece planes or a
+grid of piece codes.
+
+When numba is installed the parsers run as compiled loops over the FEN
+bytes; otherwise the same loops run as plain Python. Both take the FEN as
+ASCII bytes and a table from character code to plane, never board objects.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def build_plane_table(pieces: str):
+    """
+    Build the character code -> plane table used by ``fill_fen_planes``.
+    
+    Args:
+        pieces: Upper-case piece letters in plane order; the lower-case
+                (second player) pieces follow after all of them
+    
+    Returns:
+        128-entry table holding -1 for characters that are not pieces; an
+        int8 array for the numba kernel, a tuple for the Python loop
+    """
+    table = [-1] * 128
+    for piece_type, char in enumerate(pieces):
+        table[ord(char)] = piece_type
+        table[ord(char.lower())] = piece_type + len(pieces)
+    if njit is not None:
+        return np.array(table, dtype=np.int8)
+    return tuple(table)
+
+
+def _fill_fen_planes_python(board_fen, plane_table, out) -> None:
+    """Set ``out[plane, rank, file] = 1`` for every piece in ``board_fen``."""
+    rank = file = 0
+    for code in board_fen:
+        if code == 47:  # '/'
+            rank += 1
+            file = 0
+        elif 48 <= code <= 57:  # Digit: run of empty squares
+            file += code - 48
+        else:
+            plane = plane_table[code] if code < 128 else -1
+            if plane >= 0:
+                out[plane, rank, file] = 1.0
+            file += 1
+
+
+def _fill_fen_codes_python(board_fen, plane_table, out) -> None:
+    """Set ``out[rank, file] = plane + 1`` for every piece in ``board_fen``."""
+    rank = file = 0
+    for code in board_fen:
+        if code == 47:  # '/'
+            rank += 1
+            file = 0
+        elif 48 <= code <= 57:  # Digit: run of empty squares
+            file += code - 48
+        else:
+            plane = plane_table[code] if code < 128 else -1
+            if plane >= 0:
+                out[rank, file] = plane + 1
+            file += 1
+
+
+if njit is not None:
+    _fill_fen_planes_numba = njit(cache=True, boundscheck=False)(_fill_fen_planes_python)
+    _fill_fen_codes_numba = njit(cache=True, nogil=True, boundscheck=False)(_fill_fen_codes_python)
+    
+    def fill_fen_planes(board_fen: bytes, plane_table, out: np.ndarray) -> None:
+        """Fill ``out`` (already cleared) from the ASCII board part of a FEN."""
+        _fill_fen_planes_numba(np.frombuffer(board_fen, dtype=np.uint8), plane_table, out)
+    
+    def fill_fen_codes(board_fen: bytes, plane_table, out: np.ndarray) -> None:
+        """Fill ``out`` (already cleared, ranks x files) with piece codes, 0 for empty."""
+        _fill_fen_codes_numba(np.frombuffer(board_fen, dtype=np.uint8), plane_table, out)
+else:
+    fill_fen_planes = _fill_fen_planes_python
+    fill_fen_codes = _fill_fen_codes_python
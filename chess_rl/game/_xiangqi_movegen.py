@@ -0,0 +1,380 @@
+"""
+Legal move generation for XiangqiBoard.
+
+The board is read as a flat sequence of 90 piece codes (index row * 9 + col;
+positive = red, negative = black, rows 0-4 are red's side of the river).
+When numba is installed the generator is compiled and works on a copy of
+the int8 board array; otherwise the same code runs as plain Python on a
+list copy of the board, which is much faster to index element by element
+than an ndarray. Moves come back as flat from/to square indices; building
+XiangqiMove objects is left to the caller.
+
+Targets of the stepping pieces (with the horse leg and elephant eye that
+can block them, the river and palace bounds baked in) and the lines seen
+by chariots and cannons are precomputed per square at import.
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Giá trị tuyệt đối của quân cờ (giống game.xiangqi_board)
+_GENERAL = 1
+_ADVISOR = 2
+_ELEPHANT = 3
+_HORSE = 4
+_CHARIOT = 5
+_CANNON = 6
+_SOLDIER = 7
+
+# Upper bound on the number of pseudo-legal moves in any Xiangqi position
+MAX_MOVES = 256
+
+# Orthogonal steps (chariot, cannon, general) and diagonal steps (advisor)
+_ORTHO_DR = (1, -1, 0, 0)
+_ORTHO_DC = (0, 0, 1, -1)
+_DIAG_DR = (1, 1, -1, -1)
+_DIAG_DC = (1, -1, 1, -1)
+# Horse jumps; the leg is one step from the horse along the long side
+_HORSE_DR = (2, 2, -2, -2, 1, 1, -1, -1)
+_HORSE_DC = (1, -1, 1, -1, 2, -2, 2, -2)
+
+
+def _palace(r, c):
+    """1 if (r, c) is in red's palace, -1 if in black's, else 0."""
+    if 3 <= c <= 5:
+        if 0 <= r <= 2:
+            return 1
+        if 7 <= r <= 9:
+            return -1
+    return 0
+
+
+def _pack(rows, width):
+    """
+    Turn per-square lists of squares into a lookup table plus row lengths.
+    
+    Args:
+        rows: One list of flat square indices per row
+        width: Longest possible row
+    
+    Returns:
+        tuple of (table, counts); padded int32 arrays for the numba kernels,
+        tuples for the plain-Python loops
+    """
+    counts = [len(row) for row in rows]
+    if njit is None:
+        return tuple(tuple(row) for row in rows), tuple(counts)
+    table = np.zeros((len(rows), width), dtype=np.int32)
+    for i, row in enumerate(rows):
+        table[i, :len(row)] = row
+    return table, np.array(counts, dtype=np.int32)
+
+
+def _build_tables():
+    """Precompute target, blocking and ray squares for every board square."""
+    horse_to, horse_leg = [], []
+    horse_from, horse_from_leg = [], []
+    elephant_to, elephant_eye = [], []
+    advisor_to, general_to = [], []
+    rays = []
+    for sq in range(90):
+        r, c = divmod(sq, 9)
+        
+        # Horse targets and legs, and horses that attack sq with their legs
+        to, leg, src, src_leg = [], [], [], []
+        for hr, hc in zip(_HORSE_DR, _HORSE_DC):
+            rr, cc = r + hr, c + hc
+            if not (0 <= rr < 10 and 0 <= cc < 9):
+                continue
+            to.append(rr * 9 + cc)
+            src.append(rr * 9 + cc)
+            if hr == 2 or hr == -2:
+                leg.append((r + hr // 2) * 9 + c)
+                src_leg.append((rr - hr // 2) * 9 + cc)
+            else:
+                leg.append(r * 9 + c + hc // 2)
+                src_leg.append(rr * 9 + cc - hc // 2)
+        horse_to.append(to)
+        horse_leg.append(leg)
+        horse_from.append(src)
+        horse_from_leg.append(src_leg)
+        
+        # Elephants stay on their own side of the river
+        to, eye = [], []
+        for dr, dc in zip(_DIAG_DR, _DIAG_DC):
+            rr, cc = r + 2 * dr, c + 2 * dc
+            if 0 <= rr < 10 and 0 <= cc < 9 and (rr <= 4) == (r <= 4):
+                to.append(rr * 9 + cc)
+                eye.append((r + dr) * 9 + c + dc)
+        elephant_to.append(to)
+        elephant_eye.append(eye)
+        
+        # Advisors and generals stay inside the palace they stand in
+        palace = _palace(r, c)
+        advisor_to.append([
+            (r + dr) * 9 + c + dc for dr, dc in zip(_DIAG_DR, _DIAG_DC)
+            if palace != 0 and _palace(r + dr, c + dc) == palace
+        ])
+        general_to.append([
+            (r + dr) * 9 + c + dc for dr, dc in zip(_ORTHO_DR, _ORTHO_DC)
+            if palace != 0 and _palace(r + dr, c + dc) == palace
+        ])
+        
+        # Squares along each orthogonal line, nearest first (row sq * 4 + d)
+        for dr, dc in zip(_ORTHO_DR, _ORTHO_DC):
+            ray = []
+            rr, cc = r + dr, c + dc
+            while 0 <= rr < 10 and 0 <= cc < 9:
+                ray.append(rr * 9 + cc)
+                rr += dr
+                cc += dc
+            rays.append(ray)
+    return (_pack(horse_to, 8), _pack(horse_leg, 8)[0],
+            _pack(horse_from, 8), _pack(horse_from_leg, 8)[0],
+            _pack(elephant_to, 4), _pack(elephant_eye, 4)[0],
+            _pack(advisor_to, 4), _pack(general_to, 4), _pack(rays, 9))
+
+
+((_HORSE_TO, _HORSE_COUNT), _HORSE_LEG,
+ (_HORSE_FROM, _HORSE_FROM_COUNT), _HORSE_FROM_LEG,
+ (_ELEPHANT_TO, _ELEPHANT_COUNT), _ELEPHANT_EYE,
+ (_ADVISOR_TO, _ADVISOR_COUNT), (_GENERAL_TO, _GENERAL_COUNT),
+ (_RAYS, _RAY_LEN)) = _build_tables()
+
+
+def _is_attacked(b, sq, side):
+    """Whether square sq is attacked by the opponent of side (1 red, -1 black)."""
+    r = sq // 9
+    c = sq % 9
+    enemy = -side
+    
+    # Chariots, cannons and the facing general along the four lines
+    for d in range(4):
+        ray = _RAYS[sq * 4 + d]
+        screened = False
+        for i in range(_RAY_LEN[sq * 4 + d]):
+            p = b[ray[i]]
+            if p != 0:
+                if not screened:
+                    if p == enemy * _CHARIOT:
+                        return True
+                    # Two generals may not face each other on an open file
+                    if p == enemy * _GENERAL and _ORTHO_DC[d] == 0:
+                        return True
+                    screened = True
+                else:
+                    if p == enemy * _CANNON:
+                        return True
+                    break
+    
+    # Horses whose leg is free
+    horses = _HORSE_FROM[sq]
+    legs = _HORSE_FROM_LEG[sq]
+    for k in range(_HORSE_FROM_COUNT[sq]):
+        if b[horses[k]] == enemy * _HORSE and b[legs[k]] == 0:
+            return True
+    
+    # Soldiers step forward onto sq, or sideways once across the river
+    rr = r - enemy
+    if 0 <= rr < 10 and b[rr * 9 + c] == enemy * _SOLDIER:
+        return True
+    if (enemy > 0 and r >= 5) or (enemy < 0 and r <= 4):
+        if c > 0 and b[r * 9 + c - 1] == enemy * _SOLDIER:
+            return True
+        if c < 8 and b[r * 9 + c + 1] == enemy * _SOLDIER:
+            return True
+    return False
+
+
+def _pseudo_legal_moves(b, side, out_from, out_to):
+    """Write the moves of side that ignore checks into out_from/out_to; return the count."""
+    n = 0
+    for sq in range(90):
+        p = b[sq] * side
+        if p <= 0:
+            continue
+        
+        if p == _CHARIOT or p == _CANNON:
+            for d in range(4):
+                ray = _RAYS[sq * 4 + d]
+                screened = False
+                for i in range(_RAY_LEN[sq * 4 + d]):
+                    t = ray[i]
+                    q = b[t]
+                    if not screened:
+                        if q == 0:
+                            out_from[n] = sq
+                            out_to[n] = t
+                            n += 1
+                        elif p == _CHARIOT:
+                            if q * side < 0:
+                                out_from[n] = sq
+                                out_to[n] = t
+                                n += 1
+                            break
+                        else:
+                            # Pháo cần đúng một quân làm ngòi để ăn quân
+                            screened = True
+                    elif q != 0:
+                        if q * side < 0:
+                            out_from[n] = sq
+                            out_to[n] = t
+                            n += 1
+                        break
+        
+        elif p == _HORSE:
+            targets = _HORSE_TO[sq]
+            legs = _HORSE_LEG[sq]
+            for k in range(_HORSE_COUNT[sq]):
+                t = targets[k]
+                if b[legs[k]] == 0 and b[t] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = t
+                    n += 1
+        
+        elif p == _ELEPHANT:
+            # Bảng chỉ chứa ô cùng phía sông nên Tượng không qua sông
+            targets = _ELEPHANT_TO[sq]
+            eyes = _ELEPHANT_EYE[sq]
+            for k in range(_ELEPHANT_COUNT[sq]):
+                t = targets[k]
+                if b[eyes[k]] == 0 and b[t] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = t
+                    n += 1
+        
+        elif p == _ADVISOR or p == _GENERAL:
+            if p == _ADVISOR:
+                targets = _ADVISOR_TO[sq]
+                count = _ADVISOR_COUNT[sq]
+            else:
+                targets = _GENERAL_TO[sq]
+                count = _GENERAL_COUNT[sq]
+            for k in range(count):
+                t = targets[k]
+                if b[t] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = t
+                    n += 1
+        
+        elif p == _SOLDIER:
+            r = sq // 9
+            c = sq % 9
+            rr = r + side
+            if 0 <= rr < 10:
+                t = rr * 9 + c
+                if b[t] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = t
+                    n += 1
+            # Tốt qua sông được đi ngang
+            if (side > 0 and r >= 5) or (side < 0 and r <= 4):
+                if c > 0 and b[sq - 1] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = sq - 1
+                    n += 1
+                if c < 8 and b[sq + 1] * side <= 0:
+                    out_from[n] = sq
+                    out_to[n] = sq + 1
+                    n += 1
+    return n
+
+
+def _legal_moves(b, side, out_from, out_to):
+    """
+    Write the legal moves of side into out_from/out_to and return the count.
+    
+    Each pseudo-legal move is made on b, kept if the own general is not
+    attacked afterwards (including facing the other general) and unmade,
+    so b is unchanged on return.
+    """
+    n = _pseudo_legal_moves(b, side, out_from, out_to)
+    
+    own_general = side * _GENERAL
+    general_sq = -1
+    for sq in range(90):
+        if b[sq] == own_general:
+            general_sq = sq
+            break
+    if general_sq < 0:
+        return n
+    
+    count = 0
+    for i in range(n):
+        f = out_from[i]
+        t = out_to[i]
+        moving = b[f]
+        captured = b[t]
+        b[t] = moving
+        b[f] = 0
+        king = t if moving == own_general else general_sq
+        legal = not _is_attacked(b, king, side)
+        b[f] = moving
+        b[t] = captured
+        if legal:
+            out_from[count] = f
+            out_to[count] = t
+            count += 1
+    return count
+
+
+if njit is not None:
+    _is_attacked = njit(cache=True)(_is_attacked)
+    _pseudo_legal_moves = njit(cache=True)(_pseudo_legal_moves)
+    _legal_moves_numba = njit(cache=True)(_legal_moves)
+    
+    def generate_legal_moves(board: np.ndarray, side: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the legal moves of side on a (10, 9) int8 board.
+        
+        Args:
+            board: Board array (not modified)
+            side: 1 for red, -1 for black
+        
+        Returns:
+            tuple of (from_idx, to_idx) int32 arrays of flat square indices
+        """
+        out_from = np.empty(MAX_MOVES, dtype=np.int32)
+        out_to = np.empty(MAX_MOVES, dtype=np.int32)
+        n = _legal_moves_numba(board.ravel().copy(), side, out_from, out_to)
+        return out_from[:n], out_to[:n]
+else:
+    def generate_legal_moves(board: np.ndarray, side: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the legal moves of side on a (10, 9) int8 board.
+        
+        Args:
+            board: Board array (not modified)
+            side: 1 for red, -1 for black
+        
+        Returns:
+            tuple of (from_idx, to_idx) int32 arrays of flat square indices
+        """
+        out_from = [0] * MAX_MOVES
+        out_to = [0] * MAX_MOVES
+        n = _legal_moves(board.ravel().tolist(), side, out_from, out_to)
+        return np.array(out_from[:n], dtype=np.int32), np.array(out_to[:n], dtype=np.int32)
+
+
+def is_in_check(board: np.ndarray, side: int) -> bool:
+    """
+    Whether the general of side is attacked on a (10, 9) int8 board.
+    
+    Args:
+        board: Board array (not modified)
+        side: 1 for red, -1 for black
+    
+    Returns:
+        True if the general is attacked; False if it is not or is missing
+    """
+    flat = board.ravel()
+    found = np.flatnonzero(flat == side * _GENERAL)
+    if not len(found):
+        return False
+    b = flat if njit is not None else flat.tolist()
+    return bool(_is_attacked(b, int(found[0]), side))
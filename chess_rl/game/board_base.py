@@ -61,22 +61,27 @@ class BoardBase(Generic[M], ABC):
         pass
     
     @abstractmethod
-    def to_observation(self) -> np.ndarray:
+    def to_observation(self, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Convert the board state to a tensor observation.
         
+        Args:
+            out: Optional preallocated float32 array of the observation shape;
+                 if given it is cleared, filled in place and returned
+            
         Returns:
             Numpy array with appropriate shape for the specific game
         """
         pass
     
     @abstractmethod
-    def get_state_hash(self) -> str:
+    def get_state_hash(self) -> int:
         """
         Get a compact representation of the board state for hashing.
         
         Returns:
-            String representation of the current board state
+            64-bit integer key of the current board state; equal positions
+            give equal keys
         """
         pass
     
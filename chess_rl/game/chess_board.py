@@ -8,6 +8,35 @@ from typing import List, Tuple, Optional, Dict, Any
 from game.board_base import BoardBase
 
 
+def unpack_planes(packed: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Expand packed piece bitboards into float32 observation planes.
+    
+    Accepts a single position or a whole batch, so a batch of positions
+    collected with to_observation_packed is expanded in one call, e.g.
+    ``unpack_planes(np.stack([b.to_observation_packed() for b in boards]))``.
+    
+    Args:
+        packed: uint64 array of shape (12,) or (N, 12) from
+                ChessBoard.to_observation_packed
+        out: Optional preallocated float32 array of the result shape to fill
+        
+    Returns:
+        Numpy array with shape (12, 8, 8) or (N, 12, 8, 8); each position
+        matches ChessBoard.to_observation
+    """
+    packed = np.ascontiguousarray(packed, dtype='<u8')
+    # Bit i of each bitboard is square i (a1=0 .. h8=63); reverse the
+    # ranks so rank 8 is row 0
+    planes = np.unpackbits(packed.view(np.uint8), axis=-1, bitorder='little')
+    planes = planes.reshape(packed.shape + (8, 8))[..., ::-1, :]
+    
+    if out is None:
+        return planes.astype(np.float32)
+    np.copyto(out, planes)
+    return out
+
+
 class ChessBoard(BoardBase[chess.Move]):
     """
     Chess board implementation with standardized interface for RL environments.
@@ -45,22 +74,42 @@ class ChessBoard(BoardBase[chess.Move]):
     NUM_COLORS = 2
     NUM_PLANES = NUM_PIECE_TYPES * NUM_COLORS  # 12 planes
     
-    def __init__(self, fen: Optional[str] = None):
+    def __init__(self, fen: Optional[str] = None, exact_game_over: bool = False):
         """
         Initialize a chess board, optionally from a given FEN string.
         
         Args:
             fen: Optional FEN string to initialize the board
+            exact_game_over: Detect the end of the game after each move with
+                the full ``chess.Board.outcome()``, including fivefold
+                repetition; by default the repetition scan is skipped
         """
         self.board = chess.Board(fen) if fen else chess.Board()
-        self.move_history = []
+        self.exact_game_over = exact_game_over
         self.result = None
+        # Legal moves of the current position, filled lazily and cleared
+        # by apply_move/reset
+        self._legal_cache: Optional[List[chess.Move]] = None
+        self._legal_set: Optional[frozenset] = None
+        self._legal_tensor = None
     
     def reset(self) -> None:
         """Reset the board to initial position."""
         self.board.reset()
-        self.move_history = []
         self.result = None
+        self._invalidate_legal_cache()
+    
+    @property
+    def move_history(self) -> List[chess.Move]:
+        """Moves played since the board was created or reset, oldest first."""
+        # python-chess already records every push; no second list is kept
+        return list(self.board.move_stack)
+    
+    def _invalidate_legal_cache(self) -> None:
+        """Forget the cached legal moves after the position has changed."""
+        self._legal_cache = None
+        self._legal_set = None
+        self._legal_tensor = None
     
     def get_legal_moves(self, player: Optional[bool] = None) -> List[chess.Move]:
         """
@@ -71,13 +120,72 @@ class ChessBoard(BoardBase[chess.Move]):
                    If None, returns moves for current player
         
         Returns:
-            List of legal chess.Move objects
+            List of legal chess.Move objects; the list is cached until the
+            next move or reset and must not be modified
         """
         # If player is specified and it's not their turn, return empty list
         if player is not None and player != self.board.turn:
             return []
         
-        return list(self.board.legal_moves)
+        if self._legal_cache is None:
+            self._legal_cache = list(self.board.legal_moves)
+        return self._legal_cache
+    
+    def has_legal_moves(self) -> bool:
+        """
+        Check whether the side to move has any legal move.
+        
+        Uses the cached legal moves if they were already generated,
+        otherwise stops at the first legal move found.
+        
+        Returns:
+            True if at least one legal move exists
+        """
+        if self._legal_cache is not None:
+            return bool(self._legal_cache)
+        return any(True for _ in self.board.generate_legal_moves())
+    
+    def num_legal_moves(self) -> int:
+        """
+        Get the number of legal moves for the side to move.
+        
+        Returns:
+            Length of the cached get_legal_moves list
+        """
+        return len(self.get_legal_moves())
+    
+    def legal_move_at(self, index: int) -> chess.Move:
+        """
+        Get one legal move by index, e.g. ``randrange(num_legal_moves())``.
+        
+        Args:
+            index: Position in the get_legal_moves order
+        
+        Returns:
+            The legal move at that position
+        """
+        return self.get_legal_moves()[index]
+    
+    def get_legal_move_tensor(self) -> Tuple[List[chess.Move], np.ndarray, np.ndarray]:
+        """
+        Get the legal moves together with their from/to squares as arrays.
+        
+        The result is computed once per position and shared between calls
+        (the list is the one returned by get_legal_moves), so the returned
+        list and arrays must not be modified.
+        
+        Returns:
+            tuple of (moves, from_squares, to_squares)
+            - moves is the list of legal chess.Move objects
+            - from_squares and to_squares are int32 arrays of shape (N,)
+        """
+        if self._legal_tensor is None:
+            moves = self.get_legal_moves()
+            n = len(moves)
+            from_squares = np.fromiter((m.from_square for m in moves), dtype=np.int32, count=n)
+            to_squares = np.fromiter((m.to_square for m in moves), dtype=np.int32, count=n)
+            self._legal_tensor = (moves, from_squares, to_squares)
+        return self._legal_tensor
     
     def apply_move(self, move: chess.Move) -> Tuple[float, bool]:
         """
@@ -94,69 +202,265 @@ class ChessBoard(BoardBase[chess.Move]):
             - reward is 0 for draw
             - done is True if the game is over
         """
-        # Check if move is legal
-        if move not in self.board.legal_moves:
+        # Check if move is legal: against the cached moves if this position's
+        # moves were already generated, otherwise without generating them
+        if self._legal_cache is not None:
+            if self._legal_set is None:
+                self._legal_set = frozenset(self._legal_cache)
+            is_legal = move in self._legal_set
+        else:
+            is_legal = self.board.is_legal(move)
+        if not is_legal:
             raise ValueError(f"Illegal move: {move}")
         
-        # Keep track of game state before the move
-        is_check_before = self.board.is_check()
-        player_before = self.board.turn
-        
         # Apply the move
-        self.move_history.append(move)
         self.board.push(move)
+        self._invalidate_legal_cache()
         
         # Check game termination
         reward = 0.0
         done = False
         
-        if self.board.is_game_over():
+        result = self._outcome_after_move()
+        if result is not None:
             done = True
-            result = self.board.outcome()
             self.result = result
             
             if result is not None and result.winner is not None:
-                # Assign rewards based on who won
-                reward = 1.0 if result.winner == player_before else -1.0
+                # Assign rewards based on who won; push flipped the turn, so
+                # the player who just moved is the side not to move
+                reward = 1.0 if result.winner != self.board.turn else -1.0
             else:
                 # Draw or unknown result
                 reward = 0.0
         
         return reward, done
     
+    def apply_moves(self, moves: List[chess.Move]) -> Tuple[float, bool]:
+        """
+        Apply a sequence of moves, checking for the end of the game only once.
+        
+        Intended for rollouts: the moves are not checked for legality (the
+        caller guarantees it, e.g. by sampling from get_legal_moves) and the
+        game is only tested for termination after the last move.
+        
+        Args:
+            moves: chess.Move objects to push in order
+        
+        Returns:
+            tuple of (reward, done) as for apply_move, seen from the player
+            who made the last move
+        """
+        board = self.board
+        push = board.push
+        for move in moves:
+            push(move)
+        self._invalidate_legal_cache()
+        
+        if not moves:
+            return 0.0, self.is_game_over()
+        
+        result = self._outcome_after_move()
+        if result is None:
+            return 0.0, False
+        
+        self.result = result
+        if result.winner is None:
+            return 0.0, True
+        # The side to move now is the opponent of the last mover
+        return (1.0 if result.winner != board.turn else -1.0), True
+    
+    def rollout(self, moves: List[chess.Move]) -> Tuple[float, bool]:
+        """
+        Play out a sequence of moves and take them back again.
+        
+        The moves are not checked for legality, and the board (including
+        move_history and any cached legal moves) is left as it was.
+        
+        Args:
+            moves: chess.Move objects to push in order
+        
+        Returns:
+            tuple of (reward, done) of the final position, seen from the
+            player who made the last move
+        """
+        board = self.board
+        push = board.push
+        for move in moves:
+            push(move)
+        
+        reward, done = 0.0, False
+        if moves:
+            result = self._outcome_after_move()
+            if result is not None:
+                done = True
+                if result.winner is not None:
+                    reward = 1.0 if result.winner != board.turn else -1.0
+        else:
+            done = self.is_game_over()
+        
+        pop = board.pop
+        for _ in range(len(moves)):
+            pop()
+        return reward, done
+    
+    def _outcome_after_move(self) -> Optional[chess.Outcome]:
+        """
+        Get the outcome of the position reached by the last move.
+        
+        Unless exact_game_over is set, the fivefold repetition check (which
+        walks the whole move stack) is skipped; games that only repeat are
+        left to the env's step limit. Terminations are checked in the same
+        order as ``chess.Board.outcome()``.
+        
+        Returns:
+            chess.Outcome, or None if the game goes on
+        """
+        board = self.board
+        if self.exact_game_over:
+            return board.outcome()
+        
+        # Generate moves once for both checkmate and stalemate
+        has_moves = any(board.generate_legal_moves())
+        if not has_moves and board.is_check():
+            return chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+        if board.is_insufficient_material():
+            return chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+        if not has_moves:
+            return chess.Outcome(chess.Termination.STALEMATE, None)
+        if board.is_seventyfive_moves():
+            return chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+        return None
+    
+    def _outcome(self) -> Optional[chess.Outcome]:
+        """
+        Get the outcome of the current position, as ``chess.Board.outcome()``.
+        
+        Checkmate and stalemate are read from the cached legal moves (which
+        get_legal_moves then reuses) instead of generating them again. As in
+        _outcome_after_move, fivefold repetition is only reported when
+        exact_game_over is set, so is_game_over agrees with apply_move.
+        
+        Returns:
+            chess.Outcome, or None if the game goes on
+        """
+        board = self.board
+        has_moves = bool(self.get_legal_moves())
+        if not has_moves and board.is_check():
+            return chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+        if board.is_insufficient_material():
+            return chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+        if not has_moves:
+            return chess.Outcome(chess.Termination.STALEMATE, None)
+        if board.is_seventyfive_moves():
+            return chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+        if self.exact_game_over and board.is_fivefold_repetition():
+            return chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+        return None
+    
+    def snapshot(self) -> Tuple[chess.Board, Any]:
+        """
+        Capture the current state so it can be brought back with restore().
+        
+        Returns:
+            Opaque snapshot to pass to restore()
+        """
+        # Full copy keeps the move stack, so move_history and repetition
+        # detection are intact after restoring
+        return self.board.copy(), self.result
+    
+    def restore(self, snap: Tuple[chess.Board, Any]) -> None:
+        """
+        Restore the state captured by snapshot().
+        
+        The snapshot stays valid and can be restored again.
+        
+        Args:
+            snap: Value returned by snapshot()
+        """
+        board, result = snap
+        self.board = board.copy()
+        self.result = result
+        self._invalidate_legal_cache()
+    
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        return self.board.is_game_over()
+        return self._outcome() is not None
     
-    def to_observation(self) -> np.ndarray:
+    def to_observation(self, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Convert the board state to a tensor observation.
         
+        Args:
+            out: Optional preallocated float32 array of the observation shape;
+                 if given it is cleared, filled in place and returned
+            
         Returns:
             Numpy array with shape (NUM_PLANES, BOARD_SIZE, BOARD_SIZE)
             where NUM_PLANES=12 (6 piece types x 2 colors)
         """
-        observation = np.zeros((self.NUM_PLANES, self.BOARD_SIZE, self.BOARD_SIZE), dtype=np.float32)
+        return unpack_planes(self.to_observation_packed(), out=out)
+    
+    def to_observation_packed(self) -> np.ndarray:
+        """
+        Get the observation planes as one bitboard per plane.
+        
+        96 bytes instead of the 3 KB of to_observation, for keeping
+        observations around (e.g. per search node) until they are fed to a
+        network; expand them with unpack_planes.
         
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece is not None:
-                # Get row and column from square index
-                row, col = divmod(square, self.BOARD_SIZE)
-                row = 7 - row  # Flip rows to match chess coordinate system
-                
-                # Set the corresponding plane
-                plane_idx = self.PIECE_TO_PLANE[(piece.piece_type, piece.color)]
-                observation[plane_idx, row, col] = 1.0
-                
-        return observation
+        Returns:
+            uint64 array of shape (NUM_PLANES,) in PIECE_TO_PLANE order;
+            bit i of each entry is square i (a1=0 .. h8=63)
+        """
+        board = self.board
+        white, black = board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK]
+        piece_bbs = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+        return np.array([bb & white for bb in piece_bbs] + [bb & black for bb in piece_bbs], dtype=np.uint64)
+    
+    @classmethod
+    def to_observation_batch(cls, boards: List['ChessBoard'], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert several boards to observations in one pass.
+        
+        The boards' bitboards are gathered into one (N, 12) array and
+        expanded with a single unpack_planes call.
+        
+        Args:
+            boards: ChessBoard objects to encode
+            out: Optional preallocated float32 array of shape (N, 12, 8, 8)
+            
+        Returns:
+            Numpy array with shape (N, 12, 8, 8); entry i equals
+            boards[i].to_observation()
+        """
+        packed = np.empty((len(boards), cls.NUM_PLANES), dtype=np.uint64)
+        for i, board in enumerate(boards):
+            packed[i] = board.to_observation_packed()
+        return unpack_planes(packed, out=out)
     
-    def get_state_hash(self) -> str:
+    def get_state_hash(self) -> int:
         """
         Get a compact representation of the board state for hashing.
         
+        Hashes python-chess's transposition key (piece bitboards, side to
+        move, castling rights and en passant square), which the board keeps
+        up to date on every push, so no FEN has to be built.
+        
         Returns:
-            FEN string representing the current board state
+            64-bit integer key of the current board state
+        """
+        return hash(self.board._transposition_key()) & 0xFFFFFFFFFFFFFFFF
+    
+    def get_fen(self) -> str:
+        """
+        Get the FEN string of the current position.
+        
+        Use get_state_hash for transposition lookups; this builds a new
+        string on every call.
+        
+        Returns:
+            FEN string of the board
         """
         return self.board.fen()
     
@@ -171,16 +475,9 @@ class ChessBoard(BoardBase[chess.Move]):
             - moves: number of moves played
             - or empty dictionary if game is not over
         """
-        if not self.is_game_over():
-            return {}
-        
-        result = self.board.outcome()
+        result = self._outcome()
         if result is None:
-            return {
-                'winner': None,
-                'termination': 'UNKNOWN',
-                'moves': len(self.move_history)
-            }
+            return {}
         
         winner = None
         if result.winner is not None:
@@ -189,7 +486,7 @@ class ChessBoard(BoardBase[chess.Move]):
         return {
             'winner': winner,
             'termination': result.termination.name if result.termination else 'UNKNOWN',
-            'moves': len(self.move_history)
+            'moves': len(self.board.move_stack)
         }
     
     def __str__(self) -> str:
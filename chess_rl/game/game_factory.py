@@ -26,6 +26,18 @@ class GameFactory:
     XIANGQI_PYFFISH = "xiangqi_pyffish"
     XIANGQI_SIMPLE = "xiangqi_simple"
     
+    # Lowercased game type -> board / environment class
+    _BOARD_CTORS = {
+        CHESS: ChessBoard,
+        XIANGQI: XiangqiBoard,
+        XIANGQI_PYFFISH: XiangqiPyffishBoard,
+        XIANGQI_SIMPLE: SimpleXiangqiBoard,
+    }
+    _ENV_CTORS = {
+        CHESS: ChessEnv,
+        XIANGQI: XiangqiEnv,
+    }
+    
     @staticmethod
     def create_board(game_type: str) -> Union[ChessBoard, XiangqiBoard, XiangqiPyffishBoard, SimpleXiangqiBoard]:
         """
@@ -40,16 +52,11 @@ class GameFactory:
         Raises:
             ValueError: If the game type is not supported
         """
-        if game_type.lower() == GameFactory.CHESS:
-            return ChessBoard()
-        elif game_type.lower() == GameFactory.XIANGQI:
-            return XiangqiBoard()
-        elif game_type.lower() == GameFactory.XIANGQI_PYFFISH:
-            return XiangqiPyffishBoard()
-        elif game_type.lower() == GameFactory.XIANGQI_SIMPLE:
-            return SimpleXiangqiBoard()
-        else:
-            raise ValueError(f"Unsupported game type: {game_type}")
+        try:
+            board_cls = GameFactory._BOARD_CTORS[game_type.lower()]
+        except KeyError:
+            raise ValueError(f"Unsupported game type: {game_type}") from None
+        return board_cls()
     
     @staticmethod
     def create_environment(game_type: str, max_steps: Optional[int] = None) -> Union[ChessEnv, XiangqiEnv]:
@@ -66,13 +73,10 @@ class GameFactory:
         Raises:
             ValueError: If the game type is not supported
         """
-        if game_type.lower() == GameFactory.CHESS:
-            if max_steps is not None:
-                return ChessEnv(max_steps=max_steps)
-            return ChessEnv()
-        elif game_type.lower() == GameFactory.XIANGQI:
-            if max_steps is not None:
-                return XiangqiEnv(max_steps=max_steps)
-            return XiangqiEnv()
-        else:
-            raise ValueError(f"Unsupported game type: {game_type}")
\ No newline at end of file
+        try:
+            env_cls = GameFactory._ENV_CTORS[game_type.lower()]
+        except KeyError:
+            raise ValueError(f"Unsupported game type: {game_type}") from None
+        if max_steps is not None:
+            return env_cls(max_steps=max_steps)
+        return env_cls()
@@ -2,17 +2,31 @@
 Move module - Representation of a chess move with immutable properties
 """
 
+import sys
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any
 
 
-@dataclass(frozen=True)
+# Square name <-> index (a1=0, h1=7, ..., h8=63)
+_SQ_TO_UCI = [f"{chr(ord('a') + sq % 8)}{sq // 8 + 1}" for sq in range(64)]
+_UCI_TO_SQ = {name: sq for sq, name in enumerate(_SQ_TO_UCI)}
+
+# Promotion piece type <-> UCI suffix
+_PROMO_TO_CHAR = {5: 'q', 4: 'r', 3: 'b', 2: 'n'}
+_CHAR_TO_PROMO = {char: piece for piece, char in _PROMO_TO_CHAR.items()}
+
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Move:
     """
     Immutable representation of a chess move.
     
     This class is designed to be hashable and immutable, making it suitable
-    for use as dictionary keys or in sets.
+    for use as dictionary keys or in sets. On Python 3.10+ it uses
+    ``__slots__``, so instances carry no per-object ``__dict__``.
     
     Attributes:
         from_sq: The starting square (0-63)
@@ -36,24 +50,13 @@ class Move:
         Returns:
             Move object
         """
-        # Convert file and rank to square index
-        def square_to_index(file: str, rank: str) -> int:
-            file_idx = ord(file) - ord('a')
-            rank_idx = int(rank) - 1
-            return rank_idx * 8 + file_idx
-        
-        # Parse the UCI string
-        from_file, from_rank = uci_str[0], uci_str[1]
-        to_file, to_rank = uci_str[2], uci_str[3]
-        
-        from_sq = square_to_index(from_file, from_rank)
-        to_sq = square_to_index(to_file, to_rank)
+        from_sq = _UCI_TO_SQ[uci_str[:2]]
+        to_sq = _UCI_TO_SQ[uci_str[2:4]]
         
         # Check for promotion piece
         promotion = None
         if len(uci_str) == 5:
-            promotion_map = {'q': 5, 'r': 4, 'b': 3, 'n': 2}
-            promotion = promotion_map.get(uci_str[4].lower(), None)
+            promotion = _CHAR_TO_PROMO.get(uci_str[4].lower())
         
         return cls(from_sq=from_sq, to_sq=to_sq, promotion=promotion)
     
@@ -64,21 +67,11 @@ class Move:
         Returns:
             UCI format move string
         """
-        # Convert square index to file and rank
-        def index_to_square(index: int) -> Tuple[str, str]:
-            rank = index // 8 + 1
-            file = chr(ord('a') + (index % 8))
-            return file, str(rank)
-        
-        from_file, from_rank = index_to_square(self.from_sq)
-        to_file, to_rank = index_to_square(self.to_sq)
-        
-        uci = from_file + from_rank + to_file + to_rank
+        uci = _SQ_TO_UCI[self.from_sq] + _SQ_TO_UCI[self.to_sq]
         
         # Add promotion piece if applicable
         if self.promotion:
-            promotion_map = {5: 'q', 4: 'r', 3: 'b', 2: 'n'}
-            uci += promotion_map.get(self.promotion, '')
+            uci += _PROMO_TO_CHAR.get(self.promotion, '')
         
         return uci
     
@@ -4,12 +4,35 @@ Simple Xiangqi Board implementation using pyffish API
 
 import numpy as np
 import pyffish as sf
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict, Any
+from game._fen_kernels import build_plane_table, fill_fen_planes
 
 # Constants for piece representation
 RED = True    # RED là người chơi đầu tiên, tương đương WHITE trong cờ vua
 BLACK = False
 
+# Kích thước bàn cờ và số mặt phẳng của observation (7 loại quân x 2 màu)
+BOARD_SIZE_X = 9
+BOARD_SIZE_Y = 10
+NUM_PIECE_TYPES = 7
+NUM_PLANES = NUM_PIECE_TYPES * 2
+
+# FEN piece char (by ord) -> observation plane, built once at import;
+# red pieces use planes 0-6, black pieces 7-13
+_FEN_TO_PLANE = build_plane_table('PNBARCK')
+
+# pyffish variant name and its start position, looked up once at import
+_VARIANT = "xiangqi"
+_START_FEN = sf.start_fen(_VARIANT)
+
+
+@lru_cache(maxsize=65536)
+def _legal_moves_cached(variant, fen):
+    """Legal moves of a position, shared by every board that reaches the same FEN."""
+    return tuple(sf.legal_moves(variant, fen, []))
+
+
 class SimpleXiangqiBoard:
     """
     A simple implementation of Xiangqi board using pyffish API directly.
@@ -18,21 +41,21 @@ class SimpleXiangqiBoard:
     
     def __init__(self):
         """Initialize a new Xiangqi board."""
-        self.variant = "xiangqi"
-        self.current_fen = sf.start_fen(self.variant)
+        self.variant = _VARIANT
+        self.current_fen = _START_FEN
         self.move_history = []
         self.result = None
     
     def reset(self):
         """Reset the board to the starting position."""
-        self.current_fen = sf.start_fen(self.variant)
+        self.current_fen = _START_FEN
         self.move_history = []
         self.result = None
     
     def get_legal_moves(self):
         """Get a list of legal moves in the current position."""
         try:
-            return sf.legal_moves(self.variant, self.current_fen, [])
+            return list(_legal_moves_cached(self.variant, self.current_fen))
         except Exception as e:
             print(f"Error getting legal moves: {e}")
             return []
@@ -47,26 +70,20 @@ class SimpleXiangqiBoard:
         Returns:
             Tuple of (reward, is_done)
         """
-        # Check if move is legal
-        legal_moves = self.get_legal_moves()
-        if move_str not in legal_moves:
+        # Apply the move; pyffish rejects illegal moves itself, so no
+        # separate legal-move query is needed
+        try:
+            new_fen = sf.get_fen(self.variant, self.current_fen, [move_str])
+        except Exception:
             raise ValueError(f"Illegal move: {move_str}")
         
         # Update move history
         self.move_history.append(move_str)
-        
-        # Apply the move
-        try:
-            self.current_fen = sf.get_fen(self.variant, self.current_fen, [move_str])
-        except Exception as e:
-            # Revert move history if error
-            self.move_history.pop()
-            raise ValueError(f"Error making move: {e}")
+        self.current_fen = new_fen
         
         # Check if game is over (no legal moves for opponent)
         try:
-            opponent_moves = sf.legal_moves(self.variant, self.current_fen, [])
-            is_done = len(opponent_moves) == 0
+            is_done = not _legal_moves_cached(self.variant, new_fen)
         except Exception:
             is_done = False
         
@@ -81,65 +98,33 @@ class SimpleXiangqiBoard:
     def is_game_over(self):
         """Check if the game is over."""
         try:
-            return len(sf.legal_moves(self.variant, self.current_fen, [])) == 0
+            return not _legal_moves_cached(self.variant, self.current_fen)
         except Exception:
             return False
     
-    def get_observation(self):
+    def get_observation(self, out=None):
         """
         Convert the current board state to a tensor observation.
         
+        Args:
+            out: Optional preallocated float32 array of shape (14, 10, 9);
+                 if given it is cleared, filled in place and returned
+        
         Returns:
             Numpy array with shape (14, 10, 9) representing the board
             - 14 planes for 7 piece types x 2 colors
             - 10 ranks (rows)
             - 9 files (columns)
         """
-        # Constants
-        BOARD_SIZE_X = 9
-        BOARD_SIZE_Y = 10
-        NUM_PIECE_TYPES = 7
-        NUM_PLANES = NUM_PIECE_TYPES * 2  # 7 piece types x 2 colors
-        
-        # Piece mapping (FEN character to (piece_type, color))
-        piece_mapping = {
-            'P': (0, True),  # Red Pawn
-            'N': (1, True),  # Red Horse/Knight
-            'B': (2, True),  # Red Elephant
-            'A': (3, True),  # Red Advisor
-            'R': (4, True),  # Red Rook
-            'C': (5, True),  # Red Cannon
-            'K': (6, True),  # Red King
-            'p': (0, False), # Black Pawn
-            'n': (1, False), # Black Horse/Knight
-            'b': (2, False), # Black Elephant
-            'a': (3, False), # Black Advisor
-            'r': (4, False), # Black Rook
-            'c': (5, False), # Black Cannon
-            'k': (6, False), # Black King
-        }
-        
-        # Initialize empty tensor
-        obs = np.zeros((NUM_PLANES, BOARD_SIZE_Y, BOARD_SIZE_X), dtype=np.float32)
-        
-        # Parse FEN to fill the tensor
-        board_part = self.current_fen.split(' ')[0]
-        ranks = board_part.split('/')
+        if out is None:
+            obs = np.zeros((NUM_PLANES, BOARD_SIZE_Y, BOARD_SIZE_X), dtype=np.float32)
+        else:
+            obs = out
+            obs.fill(0)
         
-        # Fill the tensor with pieces from FEN
-        for rank_idx, rank in enumerate(ranks):
-            file_idx = 0
-            for char in rank:
-                if char.isdigit():
-                    # Skip empty squares
-                    file_idx += int(char)
-                else:
-                    # Place piece on board
-                    if char in piece_mapping:
-                        piece_type, is_red = piece_mapping[char]
-                        plane_idx = piece_type if is_red else piece_type + NUM_PIECE_TYPES // 2
-                        obs[plane_idx, rank_idx, file_idx] = 1.0
-                    file_idx += 1
+        # Parse the board part of the FEN to fill the tensor
+        board_part = self.current_fen.split(' ', 1)[0]
+        fill_fen_planes(board_part.encode('ascii'), _FEN_TO_PLANE, obs)
         
         return obs
     
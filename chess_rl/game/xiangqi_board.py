@@ -5,6 +5,7 @@ Xiangqi Board module - Core representation of a Xiangqi (Chinese chess) board wi
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any
 from game.board_base import BoardBase
+from game._xiangqi_movegen import generate_legal_moves, is_in_check
 
 
 # Định nghĩa hằng số cho cờ tướng
@@ -20,34 +21,159 @@ CHARIOT = 5   # Xe
 CANNON = 6    # Pháo
 SOLDIER = 7   # Tốt/Binh
 
+# Bảng Zobrist: một khóa 64-bit ngẫu nhiên (seed cố định) cho mỗi cặp
+# (quân cờ, ô). Hàng được đánh chỉ số bằng giá trị quân + 7 (từ -7 đến 7);
+# hàng 7 ứng với ô trống và toàn số 0.
+_ZOBRIST_SEED = 0x5851F42D
+_zobrist_rng = np.random.default_rng(_ZOBRIST_SEED)
+_ZOBRIST_PIECE_SQUARE = _zobrist_rng.integers(0, 2**64, size=(15, 90), dtype=np.uint64, endpoint=False)
+_ZOBRIST_PIECE_SQUARE[7] = 0
+_ZOBRIST_BLACK_TO_MOVE = int(_zobrist_rng.integers(0, 2**64, dtype=np.uint64, endpoint=False))
+# Bản Python int để cập nhật từng nước (XOR trên int nhanh hơn trên np.uint64)
+_ZOBRIST_TABLE = _ZOBRIST_PIECE_SQUARE.tolist()
+del _zobrist_rng
+
+# Mã quân của từng lớp observation, dạng (14, 1, 1) để broadcast với bàn cờ
+_PLANE_PIECE_CODES = np.array(
+    [GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER,
+     -GENERAL, -ADVISOR, -ELEPHANT, -HORSE, -CHARIOT, -CANNON, -SOLDIER],
+    dtype=np.int8,
+)[:, None, None]
+
+# Ký hiệu in ra của từng quân, theo chỉ số quân + 7 (đen viết thường)
+_SYMBOL_LUT = np.array(list("scrheag.GAEHRCS"), dtype="<U1")
+
+
+def _build_initial_board() -> np.ndarray:
+    """Build the (10, 9) int8 board of the starting position."""
+    board = np.zeros((10, 9), dtype=np.int8)
+    
+    # Đặt quân đỏ (giá trị dương)
+    # Hàng cuối (hàng 9, index 0)
+    board[0, 0] = CHARIOT    # Xe
+    board[0, 1] = HORSE      # Mã
+    board[0, 2] = ELEPHANT   # Tượng
+    board[0, 3] = ADVISOR    # Sĩ
+    board[0, 4] = GENERAL    # Tướng
+    board[0, 5] = ADVISOR    # Sĩ
+    board[0, 6] = ELEPHANT   # Tượng
+    board[0, 7] = HORSE      # Mã
+    board[0, 8] = CHARIOT    # Xe
+    
+    # Pháo (hàng 7, index 2)
+    board[2, 1] = CANNON
+    board[2, 7] = CANNON
+    
+    # Tốt (hàng 6, index 3)
+    board[3, 0] = SOLDIER
+    board[3, 2] = SOLDIER
+    board[3, 4] = SOLDIER
+    board[3, 6] = SOLDIER
+    board[3, 8] = SOLDIER
+    
+    # Đặt quân đen (giá trị âm)
+    # Hàng đầu (hàng 0, index 9)
+    board[9, 0] = -CHARIOT   # Xe
+    board[9, 1] = -HORSE     # Mã
+    board[9, 2] = -ELEPHANT  # Tượng
+    board[9, 3] = -ADVISOR   # Sĩ
+    board[9, 4] = -GENERAL   # Tướng
+    board[9, 5] = -ADVISOR   # Sĩ
+    board[9, 6] = -ELEPHANT  # Tượng
+    board[9, 7] = -HORSE     # Mã
+    board[9, 8] = -CHARIOT   # Xe
+    
+    # Pháo (hàng 2, index 7)
+    board[7, 1] = -CANNON
+    board[7, 7] = -CANNON
+    
+    # Tốt (hàng 3, index 6)
+    board[6, 0] = -SOLDIER
+    board[6, 2] = -SOLDIER
+    board[6, 4] = -SOLDIER
+    board[6, 6] = -SOLDIER
+    board[6, 8] = -SOLDIER
+    
+    return board
+
+
+# Bàn cờ ở vị trí ban đầu, dựng một lần khi import (chỉ đọc)
+_INITIAL_BOARD = _build_initial_board()
+_INITIAL_BOARD.flags.writeable = False
+
 
 class XiangqiMove:
     """
     Representation of a move in Xiangqi.
     
+    The move is stored as a single packed int ``code``; the other fields
+    are decoded from it on access.
+    
     Attributes:
+        code: Packed move (flat_from << 11 | flat_to << 4 | color << 3 | piece_type)
         from_pos: Starting position (row, col)
         to_pos: Destination position (row, col)
         piece_type: Type of the piece being moved
         piece_color: Color of the piece being moved (RED or BLACK)
+        flat_from: Starting square as a flat index (row * 9 + col)
+        flat_to: Destination square as a flat index (row * 9 + col)
     """
+    __slots__ = ('code',)
+    
     def __init__(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int], 
                  piece_type: int, piece_color: bool):
-        self.from_pos = from_pos
-        self.to_pos = to_pos
-        self.piece_type = piece_type
-        self.piece_color = piece_color
+        # Chỉ số phẳng (bàn cờ rộng 9 cột): 7 bit mỗi ô, màu 1 bit, quân 3 bit
+        self.code = ((from_pos[0] * 9 + from_pos[1]) << 11
+                     | (to_pos[0] * 9 + to_pos[1]) << 4
+                     | (8 if piece_color else 0)
+                     | piece_type)
+    
+    @classmethod
+    def from_code(cls, code: int) -> 'XiangqiMove':
+        """
+        Rebuild a move from its packed code.
+        
+        Args:
+            code: Value of a move's ``code`` attribute
+        
+        Returns:
+            XiangqiMove equal to the move the code was taken from
+        """
+        move = cls.__new__(cls)
+        move.code = code
+        return move
+    
+    @property
+    def flat_from(self) -> int:
+        return self.code >> 11
+    
+    @property
+    def flat_to(self) -> int:
+        return (self.code >> 4) & 0x7F
+    
+    @property
+    def from_pos(self) -> Tuple[int, int]:
+        return divmod(self.code >> 11, 9)
+    
+    @property
+    def to_pos(self) -> Tuple[int, int]:
+        return divmod((self.code >> 4) & 0x7F, 9)
+    
+    @property
+    def piece_type(self) -> int:
+        return self.code & 7
+    
+    @property
+    def piece_color(self) -> bool:
+        return RED if self.code & 8 else BLACK
     
     def __eq__(self, other):
         if not isinstance(other, XiangqiMove):
             return False
-        return (self.from_pos == other.from_pos and 
-                self.to_pos == other.to_pos and 
-                self.piece_type == other.piece_type and 
-                self.piece_color == other.piece_color)
+        return self.code == other.code
     
     def __hash__(self):
-        return hash((self.from_pos, self.to_pos, self.piece_type, self.piece_color))
+        return self.code
     
     def __str__(self):
         from_r, from_c = self.from_pos
@@ -104,63 +230,25 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
         # Kết quả trò chơi
         self.result = None
         
+        # Khóa Zobrist, cập nhật từng nước trong apply_move
+        self._zobrist = self._compute_zobrist()
+        
+        # Cache (moves, from_idx, to_idx) của vị trí được truy vấn gần nhất,
+        # cùng tập các nước đó để kiểm tra hợp lệ trong O(1)
+        self._legal_tensor_key = None
+        self._legal_tensor = None
+        self._legal_set = frozenset()
+        
         # Bộ đếm nửa nước đi (cho luật hòa)
         self.halfmove_clock = 0
     
     def _setup_initial_position(self):
         """Set up the initial position of pieces on the board."""
-        # Đặt quân đỏ (giá trị dương)
-        # Hàng cuối (hàng 9, index 0)
-        self.board[0, 0] = CHARIOT    # Xe
-        self.board[0, 1] = HORSE      # Mã
-        self.board[0, 2] = ELEPHANT   # Tượng
-        self.board[0, 3] = ADVISOR    # Sĩ
-        self.board[0, 4] = GENERAL    # Tướng
-        self.board[0, 5] = ADVISOR    # Sĩ
-        self.board[0, 6] = ELEPHANT   # Tượng
-        self.board[0, 7] = HORSE      # Mã
-        self.board[0, 8] = CHARIOT    # Xe
-        
-        # Pháo (hàng 7, index 2)
-        self.board[2, 1] = CANNON
-        self.board[2, 7] = CANNON
-        
-        # Tốt (hàng 6, index 3)
-        self.board[3, 0] = SOLDIER
-        self.board[3, 2] = SOLDIER
-        self.board[3, 4] = SOLDIER
-        self.board[3, 6] = SOLDIER
-        self.board[3, 8] = SOLDIER
-        
-        # Đặt quân đen (giá trị âm)
-        # Hàng đầu (hàng 0, index 9)
-        self.board[9, 0] = -CHARIOT   # Xe
-        self.board[9, 1] = -HORSE     # Mã
-        self.board[9, 2] = -ELEPHANT  # Tượng
-        self.board[9, 3] = -ADVISOR   # Sĩ
-        self.board[9, 4] = -GENERAL   # Tướng
-        self.board[9, 5] = -ADVISOR   # Sĩ
-        self.board[9, 6] = -ELEPHANT  # Tượng
-        self.board[9, 7] = -HORSE     # Mã
-        self.board[9, 8] = -CHARIOT   # Xe
-        
-        # Pháo (hàng 2, index 7)
-        self.board[7, 1] = -CANNON
-        self.board[7, 7] = -CANNON
-        
-        # Tốt (hàng 3, index 6)
-        self.board[6, 0] = -SOLDIER
-        self.board[6, 2] = -SOLDIER
-        self.board[6, 4] = -SOLDIER
-        self.board[6, 6] = -SOLDIER
-        self.board[6, 8] = -SOLDIER
+        np.copyto(self.board, _INITIAL_BOARD)
     
     def reset(self) -> None:
         """Reset the board to initial position."""
-        # Khởi tạo bàn cờ trống
-        self.board = np.zeros((self.BOARD_HEIGHT, self.BOARD_WIDTH), dtype=np.int8)
-        
-        # Thiết lập vị trí ban đầu
+        # Chép vị trí ban đầu vào mảng sẵn có (không cấp phát lại)
         self._setup_initial_position()
         
         # Reset các biến trạng thái
@@ -168,6 +256,7 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
         self.current_player = RED
         self.result = None
         self.halfmove_clock = 0
+        self._zobrist = self._compute_zobrist()
     
     def get_legal_moves(self, player: Optional[bool] = None) -> List[XiangqiMove]:
         """
@@ -180,19 +269,42 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
         Returns:
             List of legal XiangqiMove objects
         """
-        # Xác định người chơi
-        player_to_move = self.current_player if player is None else player
-        
         # Nếu không phải lượt của người chơi được chỉ định, trả về danh sách rỗng
         if player is not None and player != self.current_player:
             return []
         
-        # TODO: Triển khai thuật toán tạo nước đi hợp lệ cho cờ tướng
-        # Đây là một phiên bản giả định đơn giản
-        legal_moves = []
+        return list(self.get_legal_move_tensor()[0])
+    
+    def get_legal_move_tensor(self) -> Tuple[List[XiangqiMove], np.ndarray, np.ndarray]:
+        """
+        Get the legal moves together with their flat from/to indices as arrays.
+        
+        The result is computed once per position and shared between calls,
+        so the returned list and arrays must not be modified.
         
-        # Sẽ triển khai chi tiết sau
-        return legal_moves
+        Returns:
+            tuple of (moves, from_idx, to_idx)
+            - moves is the list of legal XiangqiMove objects
+            - from_idx and to_idx are int32 arrays of shape (N,) holding
+              flat square indices (row * 9 + col)
+        """
+        key = (self.board.tobytes(), self.current_player)
+        if key != self._legal_tensor_key:
+            player = self.current_player
+            from_idx, to_idx = generate_legal_moves(self.board, 1 if player == RED else -1)
+            
+            # Chỉ tạo đối tượng XiangqiMove ở ranh giới API
+            flat = self.board.ravel().tolist()
+            color = 8 if player == RED else 0
+            from_code = XiangqiMove.from_code
+            moves = [
+                from_code(f << 11 | t << 4 | color | abs(flat[f]))
+                for f, t in zip(from_idx.tolist(), to_idx.tolist())
+            ]
+            self._legal_tensor = (moves, from_idx, to_idx)
+            self._legal_set = frozenset(moves)
+            self._legal_tensor_key = key
+        return self._legal_tensor
     
     def apply_move(self, move: XiangqiMove) -> Tuple[float, bool]:
         """
@@ -209,19 +321,19 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
             - reward is 0 for draw
             - done is True if the game is over
         """
-        # TODO: Triển khai logic áp dụng nước đi
-        # Đây là phiên bản giả định đơn giản
-        
         # Lưu lại người chơi trước khi thực hiện nước đi
         player_before = self.current_player
         
         # Kiểm tra tính hợp lệ của nước đi
-        if move not in self.get_legal_moves():
+        self.get_legal_move_tensor()
+        if move not in self._legal_set:
             raise ValueError(f"Illegal move: {move}")
         
         # Lấy thông tin vị trí
-        from_row, from_col = move.from_pos
-        to_row, to_col = move.to_pos
+        flat_from = move.flat_from
+        flat_to = move.flat_to
+        from_row, from_col = divmod(flat_from, 9)
+        to_row, to_col = divmod(flat_to, 9)
         
         # Thực hiện nước đi
         piece = self.board[from_row, from_col]
@@ -231,63 +343,85 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
         self.board[to_row, to_col] = piece
         self.board[from_row, from_col] = 0
         
+        # Cập nhật khóa Zobrist: bỏ quân ở ô đi và quân bị ăn, đặt quân ở ô đến
+        table = _ZOBRIST_TABLE
+        self._zobrist ^= (table[piece + 7][flat_from]
+                          ^ table[captured_piece + 7][flat_to]
+                          ^ table[piece + 7][flat_to]
+                          ^ _ZOBRIST_BLACK_TO_MOVE)
+        
         # Lưu nước đi vào lịch sử
         self.move_history.append(move)
         
         # Chuyển lượt
         self.current_player = not self.current_player
         
-        # Kiểm tra kết thúc trò chơi
+        # Kiểm tra kết thúc trò chơi: bên tới lượt hết nước đi thì thua, kể cả
+        # khi không bị chiếu (cờ tướng không hòa vì hết nước như cờ vua).
+        # Các nước vừa sinh được cache lại cho lần truy vấn kế tiếp.
         reward = 0.0
         done = False
         
-        # TODO: Triển khai logic kiểm tra kết thúc trò chơi
+        if not self.get_legal_move_tensor()[0]:
+            done = True
+            self.result = self.get_result()
+            # Bên tới lượt thua nên người vừa đi luôn thắng
+            reward = 1.0
         
         return reward, done
     
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        # TODO: Triển khai logic kiểm tra kết thúc trò chơi
-        return False
+        # Hết nước đi hợp lệ là kết thúc (chiếu bí hoặc hết nước)
+        return not self.get_legal_move_tensor()[0]
     
-    def to_observation(self) -> np.ndarray:
+    def to_observation(self, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Convert the board state to a tensor observation.
         
+        Args:
+            out: Optional preallocated float32 array of the observation shape;
+                 if given it is cleared, filled in place and returned
+            
         Returns:
             Numpy array with shape (NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH)
             where NUM_PLANES=14 (7 piece types x 2 colors)
         """
-        # Khởi tạo tensor observation với toàn số 0
-        observation = np.zeros((self.NUM_PLANES, self.BOARD_HEIGHT, self.BOARD_WIDTH), 
-                              dtype=np.float32)
-        
-        # Điền thông tin vào tensor
-        for r in range(self.BOARD_HEIGHT):
-            for c in range(self.BOARD_WIDTH):
-                piece = self.board[r, c]
-                if piece != 0:
-                    # Xác định loại quân và màu sắc
-                    piece_type = abs(piece)
-                    color = piece > 0  # True nếu là quân đỏ
-                    
-                    # Tính chỉ số lớp trong tensor
-                    plane_idx = piece_type - 1 if color else piece_type + 6
-                    
-                    # Đặt giá trị vào tensor
-                    observation[plane_idx, r, c] = 1.0
+        # Khởi tạo tensor observation (hoặc dùng lại buffer)
+        if out is None:
+            observation = np.empty((self.NUM_PLANES, self.BOARD_HEIGHT, self.BOARD_WIDTH), 
+                                   dtype=np.float32)
+        else:
+            observation = out
+        
+        # Mỗi lớp là phép so sánh bàn cờ với mã quân của lớp đó: quân đỏ (>0)
+        # ở lớp piece_type - 1, quân đen (<0) ở lớp |piece| + 6; mọi lớp được
+        # ghi trong một phép so sánh broadcast, không cần xóa trước
+        np.equal(self.board[None], _PLANE_PIECE_CODES, out=observation, casting='unsafe')
         
         return observation
     
-    def get_state_hash(self) -> str:
+    def get_state_hash(self) -> int:
         """
         Get a compact representation of the board state for hashing.
         
         Returns:
-            String representation of the current board state
+            64-bit Zobrist key of the current board state
         """
-        # Đơn giản hóa bằng cách chuyển bàn cờ thành chuỗi
-        return str(self.board.tolist()) + f"|{self.current_player}"
+        return self._zobrist
+    
+    def _compute_zobrist(self) -> int:
+        """
+        Compute the Zobrist key of the current position from scratch.
+        
+        Returns:
+            64-bit Zobrist key
+        """
+        keys = _ZOBRIST_PIECE_SQUARE[self.board.ravel().astype(np.intp) + 7, np.arange(90)]
+        key = int(np.bitwise_xor.reduce(keys))
+        if self.current_player == BLACK:
+            key ^= _ZOBRIST_BLACK_TO_MOVE
+        return key
     
     def get_result(self) -> Dict[str, Any]:
         """
@@ -303,42 +437,37 @@ class XiangqiBoard(BoardBase[XiangqiMove]):
         if not self.is_game_over():
             return {}
         
-        # TODO: Triển khai logic xác định kết quả trò chơi
-        
-        # Đây là một phiên bản giả định
+        # Bên tới lượt không còn nước đi nên thua; bị chiếu là chiếu bí,
+        # không bị chiếu là hết nước (cũng tính thua)
+        loser = self.current_player
+        in_check = is_in_check(self.board, 1 if loser == RED else -1)
         return {
-            'winner': None,
-            'termination': 'UNKNOWN',
+            'winner': 'black' if loser == RED else 'red',
+            'termination': 'CHECKMATE' if in_check else 'STALEMATE',
             'moves': len(self.move_history)
         }
     
+    def row_repr(self, rank: int) -> str:
+        """
+        Get the symbols of one row of the board, as printed by __str__.
+        
+        Args:
+            rank: Row index (0 = red's back rank, 9 = black's back rank)
+        
+        Returns:
+            Piece symbols of the row from column 0 to 8, separated by spaces
+            (upper case red, lower case black, '.' for empty squares)
+        """
+        # Tra ký hiệu qua bảng (chỉ số = quân + 7)
+        return " ".join(_SYMBOL_LUT[self.board[rank] + 7])
+    
     def __str__(self) -> str:
         """String representation of the board."""
-        result = ""
-        piece_symbols = {
-            0: ".",
-            GENERAL: "G", -GENERAL: "g",
-            ADVISOR: "A", -ADVISOR: "a",
-            ELEPHANT: "E", -ELEPHANT: "e",
-            HORSE: "H", -HORSE: "h",
-            CHARIOT: "R", -CHARIOT: "r",
-            CANNON: "C", -CANNON: "c",
-            SOLDIER: "S", -SOLDIER: "s"
-        }
-        
-        # Thêm chỉ số cột ở đầu
-        result += "  "
-        for c in range(self.BOARD_WIDTH):
-            result += f"{c} "
-        result += "\n"
-        
-        # In bàn cờ với các ký hiệu
-        for r in range(self.BOARD_HEIGHT - 1, -1, -1):  # In từ trên xuống dưới
-            result += f"{r} "
-            for c in range(self.BOARD_WIDTH):
-                piece = self.board[r, c]
-                result += piece_symbols.get(piece, "?") + " "
-            result += "\n"
+        # Chỉ số cột ở đầu, sau đó in bàn cờ từ trên xuống dưới
+        lines = ["  " + "".join(f"{c} " for c in range(self.BOARD_WIDTH))]
+        for r in range(self.BOARD_HEIGHT - 1, -1, -1):
+            lines.append(f"{r} {self.row_repr(r)} ")
+        result = "\n".join(lines) + "\n"
         
         # Thêm thông tin lượt đi
         result += f"\nTurn: {'Red' if self.current_player == RED else 'Black'}"
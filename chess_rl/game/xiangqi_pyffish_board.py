@@ -2,15 +2,67 @@
 Xiangqi Board implementation using pyffish API
 """
 
+import hashlib
 import numpy as np
 import pyffish as sf
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict, Any
 from game.board_base import BoardBase
+from game._fen_kernels import build_plane_table, fill_fen_planes
 
 # Xiangqi piece constants
 RED = True    # RED là người chơi đầu tiên, tương đương WHITE trong cờ vua
 BLACK = False
 
+# pyffish variant name and its start position, looked up once at import
+_VARIANT = "xiangqi"
+_START_FEN = sf.start_fen(_VARIANT)
+
+# FEN piece char (by ord) -> observation plane, in PIECE_MAPPING order;
+# red pieces use planes 0-6, black pieces 7-13
+_FEN_TO_PLANE = build_plane_table('PNBARCK')
+_FEN_TO_PLANE_ARRAY = np.asarray(_FEN_TO_PLANE, dtype=np.int8)
+
+# Expands the digits of a FEN board part to that many '.' and drops the
+# '/' separators, leaving exactly one character per square
+_FEN_EXPAND = str.maketrans({**{str(n): '.' * n for n in range(1, 10)}, '/': None})
+
+
+# Older pyffish builds take no move list; pick the call form once at import
+try:
+    sf.legal_moves(_VARIANT, _START_FEN, [])
+    _LEGAL_MOVES_TAKES_LIST = True
+except TypeError:
+    _LEGAL_MOVES_TAKES_LIST = False
+
+
+@lru_cache(maxsize=65536)
+def _legal_moves(variant: str, fen: str) -> Tuple[str, ...]:
+    """Legal move strings of a position, computed once per FEN."""
+    if _LEGAL_MOVES_TAKES_LIST:
+        return tuple(sf.legal_moves(variant, fen, []))
+    return tuple(sf.legal_moves(variant, fen))
+
+
+@lru_cache(maxsize=65536)
+def _legal_moves_set(variant: str, fen: str) -> frozenset:
+    """The moves of _legal_moves as a set, for membership tests."""
+    return frozenset(_legal_moves(variant, fen))
+
+
+@lru_cache(maxsize=65536)
+def _legal_move_objects(variant: str, fen: str) -> Tuple['XiangqiPyffishMove', ...]:
+    """The moves of _legal_moves as interned XiangqiPyffishMove objects."""
+    return tuple(_intern_move(move_str) for move_str in _legal_moves(variant, fen))
+
+
+def _intern_move(move_str: str) -> 'XiangqiPyffishMove':
+    """Return the shared XiangqiPyffishMove for a move string."""
+    move = _MOVE_POOL.get(move_str)
+    if move is None:
+        move = _MOVE_POOL[move_str] = XiangqiPyffishMove(move_str)
+    return move
+
 
 class XiangqiPyffishMove:
     """
@@ -18,6 +70,8 @@ class XiangqiPyffishMove:
     Xiangqi moves are represented as strings like "h3h10" (source and destination squares).
     """
     
+    __slots__ = ('move_str', '_hash')
+    
     def __init__(self, move_str: str):
         """
         Initialize a Xiangqi move.
@@ -26,6 +80,7 @@ class XiangqiPyffishMove:
             move_str: String representation of the move (e.g., "h3h10")
         """
         self.move_str = move_str
+        self._hash = hash(move_str)
         
         # No validation needed - we trust pyffish to provide valid moves
         # We'll store the raw move string and use it directly
@@ -37,12 +92,18 @@ class XiangqiPyffishMove:
         return f"XiangqiPyffishMove('{self.move_str}')"
     
     def __eq__(self, other):
+        if other is self:  # Interned moves compare by identity
+            return True
         if isinstance(other, XiangqiPyffishMove):
             return self.move_str == other.move_str
         return False
     
     def __hash__(self):
-        return hash(self.move_str)
+        return self._hash
+
+
+# Move string -> shared move object; legal move lists reuse these instances
+_MOVE_POOL: Dict[str, XiangqiPyffishMove] = {}
 
 
 class XiangqiPyffishBoard(BoardBase[XiangqiPyffishMove]):
@@ -93,14 +154,20 @@ class XiangqiPyffishBoard(BoardBase[XiangqiPyffishMove]):
         Args:
             fen: Optional FEN string to initialize the board
         """
-        self.variant = "xiangqi"
-        self.current_fen = fen or sf.start_fen(self.variant)
+        self.variant = _VARIANT
+        self.current_fen = fen or _START_FEN
         self.move_history = []
         self.result = None
+        # (fen, hash) of the last get_state_hash call
+        self._hashed_fen = None
+        self._hash = 0
+        # (fen, read-only observation) of the last to_observation call
+        self._obs_fen = None
+        self._obs_cache = None
     
     def reset(self) -> None:
         """Reset the board to initial position."""
-        self.current_fen = sf.start_fen(self.variant)
+        self.current_fen = _START_FEN
         self.move_history = []
         self.result = None
     
@@ -123,14 +190,29 @@ class XiangqiPyffishBoard(BoardBase[XiangqiPyffishMove]):
         if player is not None and player != current_player:
             return []
         
-        # Get legal moves from pyffish
-        # Note: Using empty move history for compatibility with current pyffish version
-        try:
-            move_strs = sf.legal_moves(self.variant, self.current_fen, [])
-        except:
-            # Fallback for compatibility issues
-            move_strs = sf.legal_moves(self.variant, self.current_fen)
-        return [XiangqiPyffishMove(move_str) for move_str in move_strs]
+        # Get legal moves from pyffish (cached per FEN, move objects are shared)
+        return list(_legal_move_objects(_VARIANT, self.current_fen))
+    
+    def num_legal_moves(self) -> int:
+        """
+        Get the number of legal moves for the current player.
+        
+        Returns:
+            Number of legal moves, without copying the cached move tuple
+        """
+        return len(_legal_move_objects(_VARIANT, self.current_fen))
+    
+    def legal_move_at(self, index: int) -> XiangqiPyffishMove:
+        """
+        Get one legal move by index, e.g. ``randrange(num_legal_moves())``.
+        
+        Args:
+            index: Position in the get_legal_moves order
+        
+        Returns:
+            The legal move at that position
+        """
+        return _legal_move_objects(_VARIANT, self.current_fen)[index]
     
     def apply_move(self, move: XiangqiPyffishMove) -> Tuple[float, bool]:
         """
@@ -148,110 +230,144 @@ class XiangqiPyffishBoard(BoardBase[XiangqiPyffishMove]):
             - done is True if the game is over
         """
         # Check if move is legal by comparing with legal moves
-        try:
-            legal_moves = sf.legal_moves(self.variant, self.current_fen, [])
-        except:
-            # Fallback for compatibility
-            legal_moves = sf.legal_moves(self.variant, self.current_fen)
-        if move.move_str not in legal_moves:
+        if move.move_str not in _legal_moves_set(_VARIANT, self.current_fen):
             raise ValueError(f"Illegal move: {move}")
         
-        # Apply the move - update move history first
-        self.move_history.append(move.move_str)
+        return self.apply_move_unchecked(move)
+    
+    def apply_move_unchecked(self, move: XiangqiPyffishMove) -> Tuple[float, bool]:
+        """
+        Apply a move without checking it against the legal moves.
         
-        # Update FEN
-        try:
-            # Get the new position after the move
-            self.current_fen = sf.get_fen(self.variant, self.current_fen, [move.move_str])
-        except Exception as e:
-            # If there was an error, restore the state by removing the move from history
-            self.move_history.pop()
-            raise ValueError(f"Error applying move '{move}'") from e
+        For callers that took the move from get_legal_moves of the current
+        position (MCTS, self-play); otherwise use apply_move.
+        
+        Args:
+            move: A legal XiangqiPyffishMove object to apply
+            
+        Returns:
+            tuple of (reward, done), as for apply_move
+        """
+        # Get the new position after the move; pyffish raises before any
+        # state changes if the move is not legal after all
+        self.current_fen = sf.get_fen(_VARIANT, self.current_fen, [move.move_str])
+        self.move_history.append(move.move_str)
         
         # Default values
         done = False
         reward = 0
         
         # Check if game is over by seeing if there are any legal moves
-        try:
-            try:
-                next_legal_moves = sf.legal_moves(self.variant, self.current_fen, [])
-            except:
-                # Fallback for compatibility
-                next_legal_moves = sf.legal_moves(self.variant, self.current_fen)
-            done = len(next_legal_moves) == 0
+        done = not _legal_moves(_VARIANT, self.current_fen)
+        
+        if done:
+            # If no legal moves, the player who just moved won
+            current_player_char = self.current_fen.split(' ')[1]
+            # Current player has no moves (lost), previous player won
+            prev_player = current_player_char != 'w'  # w = red, b = black
             
-            if done:
-                # If no legal moves, the player who just moved won
-                current_player_char = self.current_fen.split(' ')[1]
-                # Current player has no moves (lost), previous player won
-                prev_player = current_player_char != 'w'  # w = red, b = black
-                
-                # Set reward: 1 for winner, -1 for loser
-                reward = 1 if prev_player else -1
-                
-                # Store result
-                self.result = {
-                    'winner': 'red' if prev_player else 'black',
-                    'termination': 'checkmate',
-                }
-        except Exception:
-            # If checking for game over fails, assume game continues
-            pass
+            # Set reward: 1 for winner, -1 for loser
+            reward = 1 if prev_player else -1
             
+            # Store result
+            self.result = {
+                'winner': 'red' if prev_player else 'black',
+                'termination': 'checkmate',
+            }
+        
         return reward, done
     
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        try:
-            # Check if there are legal moves
-            legal_moves = sf.legal_moves(self.variant, self.current_fen, [])
-            return len(legal_moves) == 0
-        except Exception:
-            # If the check fails, assume game is not over
-            return False
+        # Check if there are legal moves
+        return not _legal_moves(_VARIANT, self.current_fen)
     
-    def to_observation(self) -> np.ndarray:
+    def to_observation(self, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Convert the board state to a tensor observation.
         
+        The tensor is only recomputed when the FEN has changed since the
+        last call; without ``out`` the cached tensor itself is returned and
+        is read-only.
+        
+        Args:
+            out: Optional preallocated float32 array of the observation shape;
+                 if given it is overwritten in place and returned
+            
         Returns:
             Numpy array with shape (14, 10, 9) for Xiangqi
             - 14 channels (7 piece types x 2 colors)
             - 10 ranks
             - 9 files
         """
-        # Initialize observation tensor with zeros
-        observation = np.zeros((self.NUM_PLANES, self.BOARD_SIZE_Y, self.BOARD_SIZE_X), dtype=np.float32)
+        fen = self.current_fen
+        if fen is not self._obs_fen:
+            observation = np.zeros((self.NUM_PLANES, self.BOARD_SIZE_Y, self.BOARD_SIZE_X), dtype=np.float32)
+            
+            # Parse the board part of the FEN to fill the tensor
+            board_part = fen.split(' ', 1)[0]
+            fill_fen_planes(board_part.encode('ascii'), _FEN_TO_PLANE, observation)
+            
+            observation.flags.writeable = False
+            self._obs_cache = observation
+            self._obs_fen = fen
         
-        # Parse FEN to get piece positions
-        board_part = self.current_fen.split(' ')[0]
-        ranks = board_part.split('/')
-        
-        for rank_idx, rank in enumerate(ranks):
-            file_idx = 0
-            for char in rank:
-                if char.isdigit():
-                    # Skip empty squares
-                    file_idx += int(char)
-                else:
-                    # Place piece on board
-                    if char in self.PIECE_MAPPING:
-                        piece_type, is_red = self.PIECE_MAPPING[char]
-                        plane_idx = piece_type if is_red else piece_type + self.NUM_PIECE_TYPES
-                        observation[plane_idx, rank_idx, file_idx] = 1.0
-                    file_idx += 1
+        if out is None:
+            return self._obs_cache
+        np.copyto(out, self._obs_cache)
+        return out
+    
+    @classmethod
+    def batch_to_observation(cls, fens: List[str], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert many positions to observations at once.
+        
+        All board parts are expanded to one character per square and decoded
+        together, then the pieces are written with a single scatter.
+        
+        Args:
+            fens: FEN strings of the positions
+            out: Optional preallocated float32 array of shape (N, 14, 10, 9);
+                 if given it is cleared, filled in place and returned
+            
+        Returns:
+            Numpy array with shape (N, 14, 10, 9), entry i equal to
+            to_observation() of a board at fens[i]
+        """
+        shape = (len(fens), cls.NUM_PLANES, cls.BOARD_SIZE_Y, cls.BOARD_SIZE_X)
+        if out is None:
+            observation = np.zeros(shape, dtype=np.float32)
+        else:
+            observation = out
+            observation.fill(0)
+        if not fens:
+            return observation
+        
+        # One character per square, in FEN order (rank 10 first)
+        squares = ''.join(fen.split(' ', 1)[0].translate(_FEN_EXPAND) for fen in fens)
+        codes = np.frombuffer(squares.encode('ascii'), dtype=np.uint8).reshape(len(fens), cls.NUM_SQUARES)
+        planes = _FEN_TO_PLANE_ARRAY[codes]
+        
+        batch, square = np.nonzero(planes >= 0)
+        observation[batch, planes[batch, square], square // cls.BOARD_SIZE_X, square % cls.BOARD_SIZE_X] = 1.0
         
         return observation
     
-    def get_state_hash(self) -> str:
+    def get_state_hash(self) -> int:
         """
         Get a compact representation of the board state for hashing.
         
+        The digest is only recomputed when the FEN has changed since the
+        last call.
+        
         Returns:
-            String representation of the current board state (FEN)
+            64-bit integer digest of the current FEN (stable across processes)
         """
-        return self.current_fen
+        fen = self.current_fen
+        if fen is not self._hashed_fen:
+            self._hash = int.from_bytes(hashlib.blake2b(fen.encode(), digest_size=8).digest(), 'little')
+            self._hashed_fen = fen
+        return self._hash
     
     def get_result(self) -> Dict[str, Any]:
         """
@@ -3,7 +3,6 @@ Demo module for testing the chess and xiangqi implementations
 """
 
 import argparse
-import random
 from game.game_factory import GameFactory
 
 
@@ -25,12 +24,12 @@ def play_random_game(env_type, num_games=1, render=True, seed=None):
         
         while not (done or truncated):
             # Choose a random legal action
-            legal_actions = info["legal_moves"]
-            if not legal_actions:
+            num_legal = info["num_legal_moves"]
+            if not num_legal:
                 print("No legal moves available. Game ends.")
                 break
                 
-            action = random.choice(legal_actions)
+            action = int(env.rng.integers(num_legal))
             
             # Take the action
             observation, reward, done, truncated, info = env.step(action)
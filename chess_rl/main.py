@@ -6,7 +6,6 @@ and will be expanded in future implementations.
 """
 
 import argparse
-import random
 import sys
 from environments.chess_env import ChessEnv
 
@@ -26,8 +25,7 @@ def play_random_game(env, num_games=1, render=True, seed=None):
         
         while not (done or truncated):
             # Choose a random legal action
-            legal_actions = info["legal_moves"]
-            action = random.choice(legal_actions)
+            action = int(env.rng.integers(info["num_legal_moves"]))
             
             # Take the action
             observation, reward, done, truncated, info = env.step(action)
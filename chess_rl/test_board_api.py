@@ -2,12 +2,6 @@
 Script nhỏ để kiểm tra ChessBoard API hoạt động đúng.
 """
 
-import sys
-import os
-
-# Thêm thư mục gốc vào path để import từ module game
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 import chess
 from game.chess_board import ChessBoard
 
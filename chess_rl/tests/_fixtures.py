@@ -0,0 +1,20 @@
+"""
+Shared constants for the test suite.
+
+chess.Move objects and square indices used across the tests, parsed once
+at import instead of inside every test.
+"""
+
+from types import MappingProxyType
+
+import chess
+
+# Every UCI move string the tests play
+_UCI_MOVES = (
+    "d8h4", "e2e4", "e2e5", "e4d5", "e7e5",
+    "f2f3", "f3f7", "g1f3", "g2g4",
+)
+
+MOVES = MappingProxyType({uci: chess.Move.from_uci(uci) for uci in _UCI_MOVES})
+
+SQ = MappingProxyType({name: chess.parse_square(name) for name in ("d5", "e2", "e4", "e7", "e8")})
@@ -0,0 +1,29 @@
+"""
+Pytest configuration for the test suite.
+
+Puts the chess_rl directory on sys.path once per session, so the tests
+import ``game`` and ``tests`` as top-level packages.
+"""
+
+import os
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+@pytest.fixture(scope="session")
+def xq_start_fen():
+    """Start FEN of the xiangqi variant, asked from pyffish once per session."""
+    sf = pytest.importorskip("pyffish")
+    return sf.start_fen("xiangqi")
+
+
+@pytest.fixture(scope="session")
+def xq_variants():
+    """Variants supported by pyffish, listed once per session."""
+    sf = pytest.importorskip("pyffish")
+    return sf.variants()
@@ -8,13 +8,10 @@ and other chess rules.
 import pytest
 import chess
 import numpy as np
-import sys
-import os
 
-# Add the parent directory to path so we can import from game module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from game.chess_board import ChessBoard
+from game.chess_board import ChessBoard, unpack_planes
 from game.move import Move
+from tests._fixtures import MOVES, SQ
 
 
 class TestChessBoard:
@@ -26,6 +23,7 @@ class TestChessBoard:
         assert not board.is_game_over()
         assert board.board.turn == chess.WHITE
         assert len(board.get_legal_moves()) == 20  # Standard initial position has 20 legal moves
+        assert board.has_legal_moves()
     
     def test_init_from_fen(self):
         """Test board initialization from FEN string."""
@@ -61,10 +59,34 @@ class TestChessBoard:
         black_moves = board.get_legal_moves(player=chess.BLACK)
         assert len(black_moves) == 0
     
+    def test_legal_move_at(self):
+        """Test indexed access to the legal moves."""
+        board = ChessBoard()
+        moves = board.get_legal_moves()
+        assert board.num_legal_moves() == len(moves) == 20
+        assert [board.legal_move_at(i) for i in range(20)] == moves
+        
+        board.apply_move(MOVES["e2e4"])
+        assert board.legal_move_at(0) in board.board.legal_moves
+    
+    def test_get_legal_move_tensor(self):
+        """Test legal moves with their from/to square arrays."""
+        board = ChessBoard()
+        moves, from_squares, to_squares = board.get_legal_move_tensor()
+        assert len(moves) == len(from_squares) == len(to_squares) == 20
+        assert list(from_squares) == [m.from_square for m in moves]
+        assert list(to_squares) == [m.to_square for m in moves]
+        
+        # Recomputed after a move is applied
+        board.apply_move(MOVES["e2e4"])
+        moves, from_squares, _ = board.get_legal_move_tensor()
+        assert len(moves) == 20
+        assert chess.E7 in from_squares
+    
     def test_apply_move_basic(self):
         """Test applying a basic move."""
         board = ChessBoard()
-        e4 = chess.Move.from_uci("e2e4")
+        e4 = MOVES["e2e4"]
         
         reward, done = board.apply_move(e4)
         assert reward == 0  # Regular move, no reward
@@ -74,7 +96,7 @@ class TestChessBoard:
     def test_apply_illegal_move(self):
         """Test applying an illegal move."""
         board = ChessBoard()
-        illegal_move = chess.Move.from_uci("e2e5")  # Pawn can't move 3 squares
+        illegal_move = MOVES["e2e5"]  # Pawn can't move 3 squares
         
         with pytest.raises(ValueError):
             board.apply_move(illegal_move)
@@ -86,14 +108,14 @@ class TestChessBoard:
         board = ChessBoard(fen)
         
         # White captures black pawn
-        capture = chess.Move.from_uci("e4d5")
+        capture = MOVES["e4d5"]
         reward, done = board.apply_move(capture)
         
         assert reward == 0  # Regular move, no reward yet
         assert not done  # Game not over
         
         # Kiểm tra rằng có một quân cờ ở d5 và đó là quân trắng
-        piece = board.board.piece_at(chess.parse_square("d5"))
+        piece = board.board.piece_at(SQ["d5"])
         assert piece is not None, "Phải có một quân cờ ở d5"
         assert piece.color == chess.WHITE  # White piece on d5
     
@@ -104,7 +126,7 @@ class TestChessBoard:
         board = ChessBoard(fen)
         
         # Queen captures f7 pawn, delivering checkmate
-        checkmate = chess.Move.from_uci("f3f7")
+        checkmate = MOVES["f3f7"]
         reward, done = board.apply_move(checkmate)
         
         assert reward == 1.0  # White wins, positive reward
@@ -123,7 +145,7 @@ class TestChessBoard:
         
         # Verify it's a stalemate
         assert not board.board.is_check()
-        assert len(board.get_legal_moves()) == 0
+        assert not board.has_legal_moves()
         assert board.board.is_stalemate()
         
         # No moves available, but game is over due to stalemate
@@ -158,22 +180,109 @@ class TestChessBoard:
         # Check white pawns are correctly placed in plane 0 (pawns, white)
         # In initial position, white pawns are on rank 2
         white_pawn_plane = observation[0]
-        for col in range(8):
-            assert white_pawn_plane[6, col] == 1.0  # Rank 2 is index 6 (flipped)
+        np.testing.assert_array_equal(white_pawn_plane[6], np.ones(8, np.float32))  # Rank 2 is index 6 (flipped)
+        assert white_pawn_plane.sum() == 8  # No other white pawns
         
         # Check black pawns are correctly placed in plane 6 (pawns, black)
         # In initial position, black pawns are on rank 7
         black_pawn_plane = observation[6]
-        for col in range(8):
-            assert black_pawn_plane[1, col] == 1.0  # Rank 7 is index 1 (flipped)
+        np.testing.assert_array_equal(black_pawn_plane[1], np.ones(8, np.float32))  # Rank 7 is index 1 (flipped)
+        assert black_pawn_plane.sum() == 8  # No other black pawns
+    
+    def test_to_observation_out(self):
+        """Test observation written into a preallocated buffer."""
+        board = ChessBoard()
+        buffer = np.ones((12, 8, 8), dtype=np.float32)  # Stale data must be cleared
+        observation = board.to_observation(out=buffer)
+        
+        assert observation is buffer
+        np.testing.assert_array_equal(observation, board.to_observation())
+    
+    def test_to_observation_packed(self):
+        """Test packed bitboard observations unpack to the float planes."""
+        board = ChessBoard()
+        board.apply_move(MOVES["e2e4"])
+        packed = board.to_observation_packed()
+        
+        assert packed.shape == (12,)
+        assert packed.dtype == np.uint64
+        assert int(packed[0]) == int(board.board.pawns & board.board.occupied_co[chess.WHITE])
+        np.testing.assert_array_equal(unpack_planes(packed), board.to_observation())
+        
+        # A batch unpacks to the per-position observations
+        batch = np.stack([ChessBoard().to_observation_packed(), packed])
+        planes = unpack_planes(batch)
+        assert planes.shape == (2, 12, 8, 8)
+        np.testing.assert_array_equal(planes[0], ChessBoard().to_observation())
+        np.testing.assert_array_equal(planes[1], board.to_observation())
+    
+    def test_to_observation_batch(self):
+        """Test batched observations match per-board observations."""
+        board = ChessBoard()
+        board.apply_move(MOVES["e2e4"])
+        boards = [ChessBoard(), board]
+        
+        observations = ChessBoard.to_observation_batch(boards)
+        assert observations.shape == (2, 12, 8, 8)
+        assert observations.dtype == np.float32
+        for observation, b in zip(observations, boards):
+            np.testing.assert_array_equal(observation, b.to_observation())
+    
+    def test_apply_moves(self):
+        """Test applying a sequence of moves at once."""
+        board = ChessBoard()
+        moves = [MOVES[uci] for uci in ("f2f3", "e7e5", "g2g4", "d8h4")]
+        
+        reward, done = board.apply_moves(moves)
+        assert done  # Fool's mate
+        assert reward == 1.0  # Black made the last move and won
+        assert board.move_history == moves
+        assert board.get_legal_moves() == []
+    
+    def test_rollout_and_snapshot(self):
+        """Test rollouts and snapshots leave the board unchanged."""
+        board = ChessBoard()
+        board.apply_move(MOVES["f2f3"])
+        fen = board.board.fen()
+        
+        moves = [MOVES[uci] for uci in ("e7e5", "g2g4", "d8h4")]
+        assert board.rollout(moves) == (1.0, True)
+        assert board.board.fen() == fen
+        assert len(board.get_legal_moves()) == 20
+        
+        snap = board.snapshot()
+        board.apply_moves(moves)
+        board.restore(snap)
+        assert board.board.fen() == fen
+        assert board.move_history == [MOVES["f2f3"]]
+        assert not board.is_game_over()
+    
+    def test_repetition_game_over(self):
+        """Test apply_move and is_game_over agree after a fivefold repetition."""
+        shuffle = [chess.Move.from_uci(uci) for uci in ("g1f3", "g8f6", "f3g1", "f6g8")]
+        for exact in (False, True):
+            board = ChessBoard(exact_game_over=exact)
+            for move in shuffle * 4:
+                reward, done = board.apply_move(move)
+                assert done == board.is_game_over()
+            
+            assert done == exact
+            assert board.rollout([]) == (0.0, exact)
+            assert reward == 0.0
+            if exact:
+                assert board.result.termination == chess.Termination.FIVEFOLD_REPETITION
+                assert board.get_result()['termination'] == 'FIVEFOLD_REPETITION'
+            else:
+                assert board.result is None
+                assert board.get_result() == {}
     
     def test_move_history(self):
         """Test move history tracking."""
         board = ChessBoard()
         moves = [
-            chess.Move.from_uci("e2e4"),
-            chess.Move.from_uci("e7e5"),
-            chess.Move.from_uci("g1f3"),
+            MOVES["e2e4"],
+            MOVES["e7e5"],
+            MOVES["g1f3"],
         ]
         
         for move in moves:
@@ -191,7 +300,7 @@ class TestChessBoard:
         assert board1.get_state_hash() == board2.get_state_hash()
         
         # Different positions should have different hashes
-        board1.apply_move(chess.Move.from_uci("e2e4"))
+        board1.apply_move(MOVES["e2e4"])
         assert board1.get_state_hash() != board2.get_state_hash()
 
 
@@ -201,25 +310,25 @@ class TestMoveConversion:
     def test_move_from_uci(self):
         """Test creating Move from UCI string."""
         move = Move.from_uci("e2e4")
-        assert move.from_sq == chess.parse_square("e2")
-        assert move.to_sq == chess.parse_square("e4")
+        assert move.from_sq == SQ["e2"]
+        assert move.to_sq == SQ["e4"]
         assert move.promotion is None
     
     def test_move_with_promotion(self):
         """Test creating Move with promotion from UCI string."""
         move = Move.from_uci("e7e8q")
-        assert move.from_sq == chess.parse_square("e7")
-        assert move.to_sq == chess.parse_square("e8")
+        assert move.from_sq == SQ["e7"]
+        assert move.to_sq == SQ["e8"]
         assert move.promotion == 5  # Queen
     
     def test_move_to_uci(self):
         """Test converting Move to UCI string."""
-        move = Move(from_sq=chess.parse_square("e2"), to_sq=chess.parse_square("e4"))
+        move = Move(from_sq=SQ["e2"], to_sq=SQ["e4"])
         assert move.to_uci() == "e2e4"
         
         move_with_promotion = Move(
-            from_sq=chess.parse_square("e7"),
-            to_sq=chess.parse_square("e8"),
+            from_sq=SQ["e7"],
+            to_sq=SQ["e8"],
             promotion=5  # Queen
         )
         assert move_with_promotion.to_uci() == "e7e8q"
\ No newline at end of file
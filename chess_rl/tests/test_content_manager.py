@@ -0,0 +1,35 @@
+"""
+Unit tests for the lesson content manager.
+
+This module contains tests for listing and filtering lessons.
+"""
+
+from content.content_manager import ContentManager
+
+
+class TestContentManager:
+    """Test suite for ContentManager class."""
+    
+    def test_list_lessons_by_topic(self):
+        """Test filtering lessons by topic."""
+        manager = ContentManager()
+        lessons = manager.list_lessons(topics=['basics'])
+        assert any(lesson['id'] == 'chess-basics-001' for lesson in lessons)
+        assert all('basics' in lesson['topics'] for lesson in lessons)
+    
+    def test_custom_lesson_reusing_builtin_id(self):
+        """Test a custom lesson with a built-in id keeps both in topic queries."""
+        manager = ContentManager()
+        manager.add_custom_lesson({
+            'id': 'chess-basics-001',
+            'title': 'Custom',
+            'content': {},
+            'topics': ['zzz'],
+        })
+        
+        basics = manager.list_lessons(topics=['basics'])
+        assert [l['title'] for l in basics if l['id'] == 'chess-basics-001'] == [
+            manager.chess_lessons['chess-basics-001']['title']
+        ]
+        custom = manager.list_lessons(topics=['zzz'])
+        assert [l['title'] for l in custom] == ['Custom']
@@ -10,7 +10,7 @@ except ImportError:
     print("pyffish not installed. Please install with: pip install pyffish")
 
 
-def test_pyffish_basic():
+def test_pyffish_basic(xq_variants, xq_start_fen):
     """Test basic pyffish functionality with Xiangqi."""
     if not has_pyffish:
         return
@@ -22,7 +22,7 @@ def test_pyffish_basic():
     
     # List supported variants
     print("\nSupported variants:")
-    variants = sf.variants()
+    variants = xq_variants
     
     # Show some variants for brevity
     print(f"Found {len(variants)} variants including: {variants[:10]}...")
@@ -35,7 +35,7 @@ def test_pyffish_basic():
         return
     
     # Get initial FEN for xiangqi
-    init_fen = sf.start_fen("xiangqi")
+    init_fen = xq_start_fen
     print("\nInitial FEN for xiangqi:")
     print(init_fen)
     
@@ -45,7 +45,7 @@ def test_pyffish_basic():
     print(f"Sample moves: {legal_moves[:5]}...")
 
 
-def test_make_moves():
+def test_make_moves(xq_start_fen):
     """Test making moves with pyffish."""
     if not has_pyffish:
         return
@@ -54,7 +54,7 @@ def test_make_moves():
     
     # Set up variables
     variant = "xiangqi"
-    init_fen = sf.start_fen(variant)
+    init_fen = xq_start_fen
     print(f"Initial FEN: {init_fen}")
     
     # Get legal moves
@@ -107,7 +107,7 @@ def test_make_moves():
             print("Could not check if game is immediately over")
 
 
-def test_additional_functions():
+def test_additional_functions(xq_start_fen):
     """Test additional pyffish functionality (guarded for stability)."""
     if not has_pyffish:
         return
@@ -115,7 +115,7 @@ def test_additional_functions():
     print("\n=== Testing additional pyffish functions (guarded) ===")
 
     variant = "xiangqi"
-    init_fen = sf.start_fen(variant)
+    init_fen = xq_start_fen
 
     # Limit to simple, widely-supported calls to avoid native crashes
     try:
@@ -138,6 +138,8 @@ def test_additional_functions():
 
 
 if __name__ == "__main__":
-    test_pyffish_basic()
-    test_make_moves()
-    test_additional_functions()
\ No newline at end of file
+    if has_pyffish:
+        start_fen = sf.start_fen("xiangqi")
+        test_pyffish_basic(sf.variants(), start_fen)
+        test_make_moves(start_fen)
+        test_additional_functions(start_fen)
\ No newline at end of file
@@ -10,7 +10,7 @@ except ImportError:
     print("pyffish not installed. Please install with: pip install pyffish")
 
 
-def test_pyffish_xiangqi():
+def test_pyffish_xiangqi(xq_variants, xq_start_fen):
     """Test basic pyffish functionality with Xiangqi."""
     if not has_pyffish:
         return
@@ -22,7 +22,7 @@ def test_pyffish_xiangqi():
     
     # List supported variants
     print("\nSupported variants:")
-    variants = sf.variants()
+    variants = xq_variants
     print(variants)
     
     # Check if xiangqi is supported
@@ -34,7 +34,7 @@ def test_pyffish_xiangqi():
     
     # Get start FEN for xiangqi
     variant = "xiangqi"
-    start_fen = sf.start_fen(variant)
+    start_fen = xq_start_fen
     print(f"\nStart FEN for {variant}: {start_fen}")
     
     # Get legal moves from starting position
@@ -64,7 +64,7 @@ def test_pyffish_xiangqi():
         print("Function get_fen_board not available in this pyffish version")
 
 
-def test_make_moves():
+def test_make_moves(xq_start_fen):
     """Test making moves with pyffish."""
     if not has_pyffish:
         return
@@ -73,7 +73,7 @@ def test_make_moves():
     
     # Set up variables
     variant = "xiangqi"
-    init_fen = sf.start_fen(variant)
+    init_fen = xq_start_fen
     print(f"Initial FEN: {init_fen}")
     
     # Get legal moves
@@ -110,7 +110,7 @@ def test_make_moves():
                 print("Function is_game_end not available in this pyffish version")
 
 
-def test_additional_functionality():
+def test_additional_functionality(xq_start_fen):
     """Test additional pyffish functionality specific to Xiangqi."""
     if not has_pyffish:
         return
@@ -118,11 +118,13 @@ def test_additional_functionality():
     print("\n=== Testing additional pyffish functionality ===")
     
     variant = "xiangqi"
-    init_fen = sf.start_fen(variant)
+    init_fen = xq_start_fen
+    
+    # Legal moves of the start position, shared by both checks below
+    moves = sf.legal_moves(variant, init_fen, [])
     
     # Test move representation if available
     if hasattr(sf, "get_san"):
-        moves = sf.legal_moves(variant, init_fen, [])
         if moves:
             move = moves[0]
             try:
@@ -139,7 +141,6 @@ def test_additional_functionality():
     
     # Test checking detection if available
     if hasattr(sf, "gives_check"):
-        moves = sf.legal_moves(variant, init_fen, [])
         for move in moves[:5]:  # Check first 5 moves
             gives_check = sf.gives_check(variant, init_fen, [move])
             print(f"Move {move} gives check: {gives_check}")
@@ -149,7 +150,9 @@ def test_additional_functionality():
 
 if __name__ == "__main__":
     print("Running pyffish tests...")
-    test_pyffish_xiangqi()
-    test_make_moves()
-    test_additional_functionality()
+    if has_pyffish:
+        start_fen = sf.start_fen("xiangqi")
+        test_pyffish_xiangqi(sf.variants(), start_fen)
+        test_make_moves(start_fen)
+        test_additional_functionality(start_fen)
     print("Tests complete!")
\ No newline at end of file
@@ -5,12 +5,8 @@ This module contains tests for basic moves, captures, and other Xiangqi rules.
 """
 
 import pytest
-import sys
-import os
 import numpy as np
 
-# Add the parent directory to path so we can import from game module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from game.xiangqi_board import XiangqiBoard, XiangqiMove, RED, BLACK
 from game.xiangqi_board import GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER
 
@@ -61,4 +57,100 @@ class TestXiangqiBoard:
         lines = str_rep.replace("  ", "").split("\n")
         assert "9 r h e a g a e h r " in lines
     
+    def test_row_repr(self):
+        """Test single-row representation without building the whole board string."""
+        board = XiangqiBoard()
+        assert board.row_repr(9) == "r h e a g a e h r"
+        assert board.row_repr(2) == ". C . . . . . C ."
+    
+    def test_get_legal_moves(self):
+        """Test legal move generation in the initial position."""
+        board = XiangqiBoard()
+        moves = board.get_legal_moves()
+        assert len(moves) == 44
+        assert all(move.piece_color == RED for move in moves)
+        
+        # Đen không có nước đi khi đến lượt Đỏ
+        assert board.get_legal_moves(player=BLACK) == []
+        
+        moves, from_idx, to_idx = board.get_legal_move_tensor()
+        assert list(from_idx) == [m.flat_from for m in moves]
+        assert list(to_idx) == [m.flat_to for m in moves]
+    
+    def test_legal_moves_flying_general(self):
+        """Test a piece screening the generals cannot leave the file."""
+        board = XiangqiBoard()
+        board.board[:] = 0
+        board.board[0, 4] = GENERAL
+        board.board[4, 4] = CHARIOT
+        board.board[9, 4] = -GENERAL
+        
+        chariot_moves = [m for m in board.get_legal_moves() if m.piece_type == CHARIOT]
+        assert chariot_moves
+        assert all(m.to_pos[1] == 4 for m in chariot_moves)
+        
+        # Tướng không được đối mặt với Tướng đối phương
+        general_moves = [m for m in board.get_legal_moves() if m.piece_type == GENERAL]
+        assert sorted(m.to_pos for m in general_moves) == [(0, 3), (0, 5), (1, 4)]
+    
+    def test_move_code(self):
+        """Test moves are packed into a single int code."""
+        move = XiangqiMove((2, 1), (9, 1), CANNON, RED)
+        assert move.from_pos == (2, 1)
+        assert move.to_pos == (9, 1)
+        assert move.piece_type == CANNON
+        assert move.piece_color == RED
+        assert (move.flat_from, move.flat_to) == (19, 82)
+        
+        assert XiangqiMove.from_code(move.code) == move
+        assert hash(move) == move.code
+        assert move != XiangqiMove((2, 1), (9, 1), CANNON, BLACK)
+    
+    def test_apply_illegal_move(self):
+        """Test applying an illegal move."""
+        board = XiangqiBoard()
+        
+        # Xe không thể nhảy qua Mã
+        with pytest.raises(ValueError):
+            board.apply_move(XiangqiMove((0, 0), (0, 2), CHARIOT, RED))
+        
+        board.apply_move(XiangqiMove((0, 0), (1, 0), CHARIOT, RED))
+        assert board.current_player == BLACK
+    
+    def test_checkmate_detection(self):
+        """Test a game ends when the side to move is checkmated."""
+        board = XiangqiBoard()
+        board.board[:] = 0
+        board.board[0, 3] = GENERAL
+        board.board[5, 0] = CHARIOT
+        board.board[8, 8] = CHARIOT
+        board.board[9, 4] = -GENERAL
+        assert not board.is_game_over()
+        assert board.get_result() == {}
+        
+        # Xe xuống hàng cuối chiếu, Xe còn lại khóa hàng 8
+        reward, done = board.apply_move(XiangqiMove((5, 0), (9, 0), CHARIOT, RED))
+        assert done
+        assert reward == 1.0
+        assert board.is_game_over()
+        assert board.get_legal_moves() == []
+        assert board.get_result() == {'winner': 'red', 'termination': 'CHECKMATE', 'moves': 1}
+        assert board.result == board.get_result()
+    
+    def test_stalemate_is_loss(self):
+        """Test a side with no legal moves loses even when not in check."""
+        board = XiangqiBoard()
+        board.board[:] = 0
+        board.board[0, 5] = GENERAL
+        board.board[2, 3] = CHARIOT
+        board.board[8, 8] = CHARIOT
+        board.board[9, 4] = -GENERAL
+        
+        # Tướng đỏ giữ cột 5, Xe giữ cột 3 và hàng 8: Tướng đen hết nước
+        reward, done = board.apply_move(XiangqiMove((2, 3), (7, 3), CHARIOT, RED))
+        assert done
+        assert reward == 1.0
+        assert board.get_result()['termination'] == 'STALEMATE'
+        assert board.get_result()['winner'] == 'red'
+    
     # Các test khác sẽ được bổ sung khi hoàn thiện logic luật chơi
\ No newline at end of file
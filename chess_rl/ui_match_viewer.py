@@ -12,10 +12,21 @@ Note: Random play can be long; require-mate mode may restart many games.
 """
 
 import random
+import re
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Tuple, Any
+from tkinter import font as tkfont
+from typing import Optional, Tuple, Any, List
 
+import numpy as np
+
+# Pillow is optional; without it the xiangqi grid is drawn as canvas items
+try:
+    from PIL import Image, ImageDraw, ImageTk
+except ImportError:
+    Image = ImageDraw = ImageTk = None
+
+from game._fen_kernels import build_plane_table, fill_fen_codes
 from game.chess_board import ChessBoard
 from game.xiangqi_pyffish_board import (
     XiangqiPyffishBoard,
@@ -46,21 +57,58 @@ XIANGQI_UNICODE = {
     'R': '俥', 'N': '傌', 'B': '相', 'A': '仕', 'K': '帥', 'C': '炮', 'P': '兵'
 }
 
+# FEN letter <-> piece code (0 empty) for the renderer's occupancy grid
+_XQ_PIECES = 'PNBARCK'
+_XQ_FEN_TO_PLANE = build_plane_table(_XQ_PIECES)
+_XQ_LETTERS = (None,) + tuple(_XQ_PIECES + _XQ_PIECES.lower())
+
+# FEN letter -> (glyph, text color when colorized: red upper case, black lower case)
+_XQ_TABLE = {ch: (sym, "#B00000" if ch.isupper() else "#111111") for ch, sym in XIANGQI_UNICODE.items()}
+
+# Xiangqi move string such as 'h3h10': file letter and 1-based rank, twice
+_MOVE_RE = re.compile(r'^([a-i])(\d{1,2})([a-i])(\d{1,2})$')
+
 
 class ChessRenderer:
     def __init__(self, canvas: tk.Canvas, cell: int = 64, margin: int = 20):
         self.canvas = canvas
         self.cell = cell
         self.margin = margin
+        self._font_cell: Optional[int] = None
+        # Last size set on the canvas; config is skipped when unchanged
+        self._cached_size = (-1, -1)
+        self.invalidate()
 
     def board_size(self) -> Tuple[int, int]:
         return 8, 8
 
+    def invalidate(self):
+        """Forget the drawn canvas state so the next draw starts from scratch."""
+        # Squares are drawn once (tag "squares"); piece items are kept per
+        # square and only touched where the piece changed since the last draw
+        self._static_drawn = False
+        self._prev_occ: List[Optional[str]] = [None] * 64
+        self._text_ids: List[Optional[int]] = [None] * 64
+        # One font object shared by all piece items, rebuilt if cell changes
+        if self._font_cell != self.cell:
+            self.piece_font = tkfont.Font(root=self.canvas, family="Segoe UI Symbol", size=self.cell // 2)
+            self._font_cell = self.cell
+
     def draw(self, board: Any, last_move: Optional[Any] = None):
-        self.canvas.delete("all")
+        if not self._static_drawn:
+            self.canvas.delete("all")
+            self._draw_static()
+            self._static_drawn = True
+        self.canvas.delete("hl")
+        self._draw_dynamic(board, last_move)
+
+    def _draw_static(self):
         cols, rows = self.board_size()
-        w = cols * self.cell
-        h = rows * self.cell
+        # Resize canvas if needed
+        size = (cols * self.cell, rows * self.cell)
+        if size != self._cached_size:
+            self.canvas.config(width=size[0], height=size[1])
+            self._cached_size = size
         # Draw squares
         for r in range(rows):
             for c in range(cols):
@@ -69,135 +117,225 @@ class ChessRenderer:
                 x1 = x0 + self.cell
                 y1 = y0 + self.cell
                 color = "#EEEED2" if (r + c) % 2 == 0 else "#769656"
-                self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, width=0)
+                self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, width=0, tags="squares")
 
+    def _draw_dynamic(self, board: Any, last_move: Optional[Any]):
         # Highlight last move
         if last_move is not None:
-            fr = 7 - (last_move.from_square // 8)
-            fc = last_move.from_square % 8
-            tr = 7 - (last_move.to_square // 8)
-            tc = last_move.to_square % 8
+            fr = 7 - (last_move.from_square >> 3)
+            fc = last_move.from_square & 7
+            tr = 7 - (last_move.to_square >> 3)
+            tc = last_move.to_square & 7
             for (rr, cc) in [(fr, fc), (tr, tc)]:
                 x0 = cc * self.cell
                 y0 = rr * self.cell
                 x1 = x0 + self.cell
                 y1 = y0 + self.cell
-                self.canvas.create_rectangle(x0, y0, x1, y1, outline="#F6F669", width=3)
-
-        # Draw pieces
+                self.canvas.create_rectangle(x0, y0, x1, y1, outline="#F6F669", width=3, tags="hl")
+            # Keep the highlight under the pieces
+            self.canvas.tag_raise("hl", "squares")
+
+        # Update pieces only on squares whose occupant changed
+        new_occ: List[Optional[str]] = [None] * 64
+        for sq, piece in board.board.piece_map().items():
+            new_occ[sq] = CHESS_UNICODE[(piece.piece_type, piece.color)]
+        prev_occ = self._prev_occ
+        text_ids = self._text_ids
+        create_text = self.canvas.create_text
+        cell = self.cell
         for sq in chess.SQUARES:
-            piece = board.board.piece_at(sq)
-            if piece:
-                rr, cc = divmod(sq, 8)
-                rr = 7 - rr
-                sym = CHESS_UNICODE[(piece.piece_type, piece.color)]
-                x = cc * self.cell + self.cell // 2
-                y = rr * self.cell + self.cell // 2
-                self.canvas.create_text(x, y, text=str(sym), font=("Segoe UI Symbol", self.cell // 2))
+            sym = new_occ[sq]
+            old = prev_occ[sq]
+            if sym == old:
+                continue
+            if sym is None:
+                self.canvas.delete(text_ids[sq])
+                text_ids[sq] = None
+            elif old is None:
+                rr = 7 - (sq >> 3)
+                cc = sq & 7
+                x = cc * cell + cell // 2
+                y = rr * cell + cell // 2
+                text_ids[sq] = create_text(x, y, text=sym, font=self.piece_font, tags="pieces")
+            else:
+                self.canvas.itemconfig(text_ids[sq], text=sym)
+        self._prev_occ = new_occ
 
 
 class XiangqiRenderer:
+    LINE_COLOR = "#6B6157"
+    # Star points (炮 & 兵 positions) as (file, rank index)
+    STAR_POINTS = (
+        (1, 2), (7, 2), (0, 3), (2, 3), (4, 3), (6, 3), (8, 3),
+        (1, 7), (7, 7), (0, 6), (2, 6), (4, 6), (6, 6), (8, 6)
+    )
+
     def __init__(self, canvas: tk.Canvas, cell: int = 56, margin: int = 20, colorize: bool = True):
         self.canvas = canvas
         self.cell = cell
         self.margin = margin
         self.colorize = colorize
+        self._table_key: Optional[Tuple[int, int]] = None
+        # Last size set on the canvas; config is skipped when unchanged
+        self._cached_size = (-1, -1)
+        self.invalidate()
 
     def board_size(self) -> Tuple[int, int]:
         return 9, 10
 
+    def invalidate(self):
+        """Forget the drawn canvas state so the next draw starts from scratch."""
+        # Background, river, grid, palace and stars are drawn once (tag
+        # "static"); the disc and text of each piece are kept per
+        # intersection (row-major, top rank first) and only touched where
+        # the piece code changed since the last draw
+        self._static_drawn = False
+        self._disc_ids: List[Optional[int]] = [None] * 90
+        self._text_ids: List[Optional[int]] = [None] * 90
+        self._occ = np.zeros((10, 9), dtype=np.uint8)
+        self._occ_prev = np.zeros((10, 9), dtype=np.uint8)
+        if self._table_key != (self.cell, self.margin):
+            self._rebuild_tables()
+
+    def _rebuild_tables(self):
+        """Rebuild the fonts and coordinate tables that depend on cell and margin."""
+        # Font objects shared by all text items
+        self.piece_font = tkfont.Font(root=self.canvas, family="Segoe UI Symbol", size=int(self.cell * 0.42))
+        self.river_font = tkfont.Font(root=self.canvas, family="Segoe UI Symbol", size=int(self.cell * 0.5))
+        # Pixel coordinates of the intersections: x by file, y by rank index
+        cols, rows = self.board_size()
+        self._pt_x = tuple(self.margin + c * self.cell for c in range(cols))
+        self._pt_y = tuple(self.margin + r * self.cell for r in range(rows))
+        # Pre-rendered static layer (Pillow only), built on the next draw
+        self._bg = None
+        self._table_key = (self.cell, self.margin)
+
     def _parse_move_str(self, move_str: str) -> Optional[Tuple[int, int, int, int]]:
         """Parse 'h3h10' into (f_col, f_row, t_col, t_row) using 0-based rows (top=0)."""
-        if not move_str or len(move_str) < 4:
-            return None
-        i = 0
-        if not move_str[i].isalpha():
-            return None
-        f_col = ord(move_str[i].lower()) - ord('a')
-        i += 1
-        j = i
-        while j < len(move_str) and move_str[j].isdigit():
-            j += 1
-        if j == i:
-            return None
-        try:
-            f_rank = int(move_str[i:j])
-        except ValueError:
-            return None
-        i = j
-        if i >= len(move_str) or not move_str[i].isalpha():
+        m = _MOVE_RE.match(move_str or "")
+        if not m:
             return None
-        t_col = ord(move_str[i].lower()) - ord('a')
-        i += 1
-        if i >= len(move_str):
-            return None
-        try:
-            t_rank = int(move_str[i:])
-        except ValueError:
-            return None
-        f_row = 10 - f_rank
-        t_row = 10 - t_rank
-        return f_col, f_row, t_col, t_row
+        fc, fr, tc, tr = m.groups()
+        return ord(fc) - 97, 10 - int(fr), ord(tc) - 97, 10 - int(tr)
 
     def draw(self, board: Any, last_move: Optional[Any] = None):
-        self.canvas.delete("all")
+        if not self._static_drawn:
+            self.canvas.delete("all")
+            self._draw_static()
+            self._static_drawn = True
+        self.canvas.delete("highlight")
+        self._draw_dynamic(board, last_move)
+
+    def _draw_static(self):
         cols, rows = self.board_size()
         # We draw lines within a padded area so stones sit at intersections.
         pad = self.margin
         W = (cols - 1) * self.cell + pad * 2
         H = (rows - 1) * self.cell + pad * 2
+        px, py = self._pt_x, self._pt_y
+        tags = "static"
 
         # Resize canvas if needed
-        self.canvas.config(width=W, height=H)
-
-        # Background
-        self.canvas.create_rectangle(0, 0, W, H, fill="#F8F5E1", width=0)
-
-        # Helper to convert grid (file, rank index) to pixel coordinates (intersection points)
-        def pt(c, r):
-            return pad + c * self.cell, pad + r * self.cell
+        if (W, H) != self._cached_size:
+            self.canvas.config(width=W, height=H)
+            self._cached_size = (W, H)
 
         # River gap between ranks 4 and 5 (index 4 and 5). We'll draw two horizontal blocks.
         river_top_y = pad + 4 * self.cell
         river_bottom_y = pad + 5 * self.cell
-        self.canvas.create_rectangle(pad - self.cell*0.35, river_top_y, W - pad + self.cell*0.35, river_bottom_y, fill="#CFE8FF", width=0)
+        river_box = (pad - self.cell*0.35, river_top_y, W - pad + self.cell*0.35, river_bottom_y)
+
+        if Image is not None:
+            # Background, river, grid and star points as one image item;
+            # the river text stays a canvas item since it needs a Tk font
+            if self._bg is None:
+                self._bg = ImageTk.PhotoImage(self._build_background(W, H, river_box), master=self.canvas)
+            self.canvas.create_image(0, 0, image=self._bg, anchor="nw", tags=tags)
+            self.canvas.create_text(W/2, (river_top_y + river_bottom_y)/2, text="楚河   漢界", font=self.river_font, fill="#4A4A4A", tags=tags)
+            return
+
+        # Background
+        self.canvas.create_rectangle(0, 0, W, H, fill="#F8F5E1", width=0, tags=tags)
+
+        # River
+        self.canvas.create_rectangle(*river_box, fill="#CFE8FF", width=0, tags=tags)
         # River text (centered)
-        self.canvas.create_text(W/2, (river_top_y + river_bottom_y)/2, text="楚河   漢界", font=("Segoe UI Symbol", int(self.cell*0.5)), fill="#4A4A4A")
+        self.canvas.create_text(W/2, (river_top_y + river_bottom_y)/2, text="楚河   漢界", font=self.river_font, fill="#4A4A4A", tags=tags)
 
-        line_color = "#6B6157"
+        line_color = self.LINE_COLOR
+        for coords in self._grid_polylines(W):
+            self.canvas.create_line(*coords, fill=line_color, tags=tags)
 
-        # Horizontal lines: ranks 0..4 and 5..9 (skip the river crossing)
-        for r in range(rows):
-            if r == 5:  # skip drawing a line across the river center
-                continue
-            y = pad + r * self.cell
-            self.canvas.create_line(pad, y, W - pad, y, fill=line_color)
+        # Optional star points - small dots near standard coordinates
+        star_radius = 3
+        for (cx, cy) in self.STAR_POINTS:
+            x, y = px[cx], py[cy]
+            self.canvas.create_oval(x - star_radius, y - star_radius, x + star_radius, y + star_radius, fill=line_color, outline=line_color, tags=tags)
+
+    def _grid_polylines(self, W: int) -> List[List[int]]:
+        """Flat coordinate lists of the grid and palace lines, one per polyline."""
+        cols, rows = self.board_size()
+        pad = self.margin
+        px, py = self._pt_x, self._pt_y
+        polylines = []
+
+        # The legs joining the segments of each polyline only retrace lines
+        # that are drawn anyway
+        top = pad
+        river_top = pad + 4 * self.cell
+        river_bottom = pad + 5 * self.cell
+        bottom = pad + 9 * self.cell
+
+        # Horizontal lines: ranks 0..4 and 6..9 (skip the river crossing),
+        # zigzagging along the outer files
+        for ranks in (range(0, 5), range(6, rows)):
+            coords = []
+            for i, r in enumerate(ranks):
+                y = pad + r * self.cell
+                x0, x1 = (pad, W - pad) if i % 2 == 0 else (W - pad, pad)
+                coords += [x0, y, x1, y]
+            polylines.append(coords)
 
         # Vertical lines: files 0..8 all through, but break at river gap (draw two segments)
+        # Top segments (ranks 0..4) zigzag along ranks 0 and 4
+        coords = []
         for c in range(cols):
             x = pad + c * self.cell
-            # Top segment (ranks 0..4)
-            self.canvas.create_line(x, pad, x, pad + 4 * self.cell, fill=line_color)
-            # Bottom segment (ranks 5..9)
-            self.canvas.create_line(x, pad + 5 * self.cell, x, pad + 9 * self.cell, fill=line_color)
-
-        # Palace diagonals: top (ranks 0..2, files 3..5) and bottom (ranks 7..9)
-        # Top
-        self.canvas.create_line(*pt(3, 0), *pt(5, 2), fill=line_color)
-        self.canvas.create_line(*pt(5, 0), *pt(3, 2), fill=line_color)
-        # Bottom
-        self.canvas.create_line(*pt(3, 7), *pt(5, 9), fill=line_color)
-        self.canvas.create_line(*pt(5, 7), *pt(3, 9), fill=line_color)
-
-        # Optional star points (炮 & 兵 positions) - small dots near standard coordinates
+            y0, y1 = (top, river_top) if c % 2 == 0 else (river_top, top)
+            coords += [x, y0, x, y1]
+        polylines.append(coords)
+        # Bottom segments (ranks 5..9): rank 5 is not drawn, so pair the
+        # files into U shapes joined along rank 9
+        for c in range(0, cols, 2):
+            x = pad + c * self.cell
+            coords = [x, river_bottom, x, bottom]
+            if c + 1 < cols:
+                coords += [x + self.cell, bottom, x + self.cell, river_bottom]
+            polylines.append(coords)
+
+        # Palace diagonals: top (ranks 0..2, files 3..5) and bottom (ranks 7..9),
+        # each cross joined along file 5
+        polylines.append([px[3], py[0], px[5], py[2], px[5], py[0], px[3], py[2]])
+        polylines.append([px[3], py[7], px[5], py[9], px[5], py[7], px[3], py[9]])
+        return polylines
+
+    def _build_background(self, W: int, H: int, river_box: Tuple[float, float, float, float]) -> Any:
+        """Rasterize the background, river, grid and star points with Pillow."""
+        img = Image.new("RGB", (W, H), "#F8F5E1")
+        draw = ImageDraw.Draw(img)
+        draw.rectangle(river_box, fill="#CFE8FF")
+        line_color = self.LINE_COLOR
+        for coords in self._grid_polylines(W):
+            draw.line(coords, fill=line_color, width=1)
         star_radius = 3
-        star_points = [
-            (1, 2), (7, 2), (0, 3), (2, 3), (4, 3), (6, 3), (8, 3),
-            (1, 7), (7, 7), (0, 6), (2, 6), (4, 6), (6, 6), (8, 6)
-        ]
-        for (cx, cy) in star_points:
-            x, y = pt(cx, cy)
-            self.canvas.create_oval(x - star_radius, y - star_radius, x + star_radius, y + star_radius, fill=line_color, outline=line_color)
+        for (cx, cy) in self.STAR_POINTS:
+            x, y = self._pt_x[cx], self._pt_y[cy]
+            draw.ellipse((x - star_radius, y - star_radius, x + star_radius, y + star_radius), fill=line_color, outline=line_color)
+        return img
+
+    def _draw_dynamic(self, board: Any, last_move: Optional[Any]):
+        px, py = self._pt_x, self._pt_y
+        line_color = self.LINE_COLOR
 
         # Highlight last move
         if last_move is not None:
@@ -205,38 +343,58 @@ class XiangqiRenderer:
             if parsed is not None:
                 f_col, f_row, t_col, t_row = parsed
                 for (cc, rr) in [(f_col, f_row), (t_col, t_row)]:
-                    cx, cy = pt(cc, rr)
+                    cx, cy = px[cc], py[rr]
                     r = self.cell * 0.42
-                    self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, outline="#F6B26B", width=3)
-
-        # Draw pieces from FEN at intersections
-        board_part = board.current_fen.split(' ')[0]
-        ranks = board_part.split('/')
-        for row_idx, row in enumerate(ranks):
-            file_idx = 0
-            for ch in row:
-                if ch.isdigit():
-                    file_idx += int(ch)
-                else:
-                    sym = XIANGQI_UNICODE.get(ch, ch)
-                    cx, cy = pt(file_idx, row_idx)
-                    # Stone base (disc)
-                    disc_r = self.cell * 0.42
-                    # Color scheme: neutral disc always; optionally red vs black text.
-                    is_red = ch.isupper()
-                    fill_color = "#FDFBF4"  # unified neutral background
-                    if self.colorize:
-                        txt_color = "#B00000" if is_red else "#111111"
-                    else:
-                        txt_color = "#222222"
-                    self.canvas.create_oval(cx - disc_r, cy - disc_r, cx + disc_r, cy + disc_r, fill=fill_color, outline=line_color, width=2)
-                    self.canvas.create_text(cx, cy, text=str(sym), fill=txt_color, font=("Segoe UI Symbol", int(self.cell * 0.42)))
-                    file_idx += 1
+                    self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, outline="#F6B26B", width=3, tags="highlight")
+                # Keep the highlight under the pieces
+                self.canvas.tag_raise("highlight", "static")
+
+        # Parse piece codes from FEN at intersections
+        occ = self._occ
+        occ.fill(0)
+        fill_fen_codes(board.current_fen.split(' ', 1)[0].encode('ascii'), _XQ_FEN_TO_PLANE, occ)
+
+        # Update pieces only where the piece code changed
+        changed = np.flatnonzero(occ != self._occ_prev)
+        new_occ = occ.ravel()
+        prev_occ = self._occ_prev.ravel()
+        disc_ids = self._disc_ids
+        text_ids = self._text_ids
+        co = self.canvas.create_oval
+        ct = self.canvas.create_text
+        colorize = self.colorize
+        # Stone base (disc)
+        disc_r = self.cell * 0.42
+        font = self.piece_font
+        for i in changed.tolist():
+            ch = _XQ_LETTERS[new_occ[i]]
+            old = _XQ_LETTERS[prev_occ[i]]
+            if ch is None:
+                self.canvas.delete(disc_ids[i])
+                self.canvas.delete(text_ids[i])
+                disc_ids[i] = text_ids[i] = None
+                continue
+            sym, txt_color = _XQ_TABLE.get(ch, (ch, "#111111"))
+            # Color scheme: neutral disc always; optionally red vs black text.
+            if not colorize:
+                txt_color = "#222222"
+            if old is None:
+                row_idx, file_idx = divmod(i, 9)
+                cx, cy = px[file_idx], py[row_idx]
+                fill_color = "#FDFBF4"  # unified neutral background
+                disc_ids[i] = co(cx - disc_r, cy - disc_r, cx + disc_r, cy + disc_r, fill=fill_color, outline=line_color, width=2, tags="pieces")
+                text_ids[i] = ct(cx, cy, text=sym, fill=txt_color, font=font, tags="pieces")
+            else:
+                self.canvas.itemconfig(text_ids[i], text=sym, fill=txt_color)
+        self._occ_prev, self._occ = occ, self._occ_prev
 
 
 # -------------------- Controller --------------------
 
 class MatchViewer(tk.Tk):
+    # Plies played per slice of the mate search between Tk event checks
+    MATE_SEARCH_PLIES = 500
+
     def __init__(self):
         super().__init__()
         self.title("Match Viewer - Chess & Xiangqi")
@@ -250,10 +408,10 @@ class MatchViewer(tk.Tk):
         self.game_var = tk.StringVar(value="chess")
         game_sel = ttk.Combobox(ctl, textvariable=self.game_var, values=["chess", "xiangqi"], width=10, state="readonly")
         game_sel.pack(side=tk.LEFT, padx=6)
-        game_sel.bind("<<ComboboxSelected>>", lambda e: self.reset_game())
+        game_sel.bind("<<ComboboxSelected>>", lambda e: self._on_game_select())
 
         self.require_mate = tk.BooleanVar(value=True)
-        ttk.Checkbutton(ctl, text="Require Checkmate", variable=self.require_mate).pack(side=tk.LEFT, padx=6)
+        ttk.Checkbutton(ctl, text="Require Checkmate", variable=self.require_mate, command=self._on_require_mate_toggle).pack(side=tk.LEFT, padx=6)
 
         # Colorize (red vs black) enabled by default for Xiangqi
         self.colorize_var = tk.BooleanVar(value=True)
@@ -266,6 +424,12 @@ class MatchViewer(tk.Tk):
         spd.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
         # tie scale updates to var when moving
         spd.bind("<ButtonRelease-1>", lambda e: self.speed_var.set(int(spd.get())))
+        self.speed_var.trace_add("write", self._on_speed_change)
+
+        # Plies played per tick; the board is rendered once after the batch
+        ttk.Label(ctl, text="Plies/step:").pack(side=tk.LEFT, padx=(12, 2))
+        self.batch_size = tk.IntVar(value=1)
+        ttk.Spinbox(ctl, textvariable=self.batch_size, values=(1, 2, 4, 8, 16, 32, 64), width=4, state="readonly", command=self._on_batch_size_change).pack(side=tk.LEFT, padx=6)
 
         self.start_btn = ttk.Button(ctl, text="Start", command=self.toggle_run)
         self.start_btn.pack(side=tk.LEFT, padx=6)
@@ -282,6 +446,12 @@ class MatchViewer(tk.Tk):
         self.canvas.pack(padx=8, pady=8)
 
         # State
+        # Control values read on every tick are mirrored into plain
+        # attributes by the widget callbacks, avoiding a Tcl call per read
+        self._game_kind = self.game_var.get()
+        self._require_mate = self.require_mate.get()
+        self._speed = self.speed_var.get()
+        self._batch_size = self.batch_size.get()
         self.running = False
         self.after_id = None
         self.move_count = 0
@@ -293,30 +463,48 @@ class MatchViewer(tk.Tk):
         self._init_game()
 
     # ------------- Game lifecycle -------------
-    def _init_game(self):
-        game = self.game_var.get()
-        if game == "chess":
-            self.board = ChessBoard()
-            self.renderer = ChessRenderer(self.canvas, cell=64)
-            self.canvas.config(width=8*64, height=8*64)
-        else:
-            self.board = XiangqiPyffishBoard()
-            self.renderer = XiangqiRenderer(self.canvas, cell=56, colorize=self.colorize_var.get())
-            self.canvas.config(width=9*56, height=10*56)
+    def _init_game(self, render: bool = True):
+        game = self._game_kind
+        self.board = ChessBoard() if game == "chess" else XiangqiPyffishBoard()
         self.move_count = 0
         self.last_move = None
+        if not render:
+            # Restarts while searching for a mate leave the canvas alone
+            return
+        if game == "chess":
+            if not isinstance(self.renderer, ChessRenderer):
+                self.renderer = ChessRenderer(self.canvas, cell=64)
+        else:
+            if not isinstance(self.renderer, XiangqiRenderer):
+                self.renderer = XiangqiRenderer(self.canvas, cell=56, colorize=self.colorize_var.get())
+        # The renderer sizes the canvas when it draws its static layer
         rend: Any = self.renderer
+        rend.invalidate()
         rend.draw(self.board, self.last_move)
-        self.status_var.set(f"{game.title()} started. Require mate: {self.require_mate.get()}")
+        self.status_var.set(f"{game.title()} started. Require mate: {self._require_mate}")
 
     def reset_game(self):
         self.stop()
         self._init_game()
 
+    def _on_game_select(self):
+        self._game_kind = self.game_var.get()
+        self.reset_game()
+
+    def _on_require_mate_toggle(self):
+        self._require_mate = self.require_mate.get()
+
+    def _on_speed_change(self, *_):
+        self._speed = self.speed_var.get()
+
+    def _on_batch_size_change(self):
+        self._batch_size = self.batch_size.get()
+
     def _on_colorize_toggle(self):
         # Only affects Xiangqi; if current renderer is Xiangqi, update flag and redraw
         if isinstance(self.renderer, XiangqiRenderer):
             self.renderer.colorize = self.colorize_var.get()
+            self.renderer.invalidate()
             self.renderer.draw(self.board, self.last_move)
 
     def toggle_run(self):
@@ -341,62 +529,91 @@ class MatchViewer(tk.Tk):
     def _schedule_next(self):
         if not self.running:
             return
-        delay = max(50, int(self.speed_var.get()))
+        delay = max(50, int(self._speed))
         self.after_id = self.after(delay, self._step_once)
 
+    def _is_mate(self, brd: Any) -> bool:
+        # Determine if a finished game ended by checkmate
+        if isinstance(brd, ChessBoard):
+            return brd.board.is_checkmate()
+        res = brd.get_result()
+        return res.get('termination') == 'checkmate'
+
+    def _search_mate(self):
+        """
+        Play random games without rendering until one ends in checkmate.
+        
+        Runs MATE_SEARCH_PLIES plies per call and reschedules itself with
+        after(0), so Tk events are handled between slices; Pause and Reset
+        cancel the pending slice through stop(). The search ends when a game
+        ends in checkmate or when "Require Checkmate" is switched off.
+        """
+        self.after_id = None
+        brd: Any = self.board
+        if self._require_mate:
+            for _ in range(self.MATE_SEARCH_PLIES):
+                if brd.is_game_over():
+                    if self._is_mate(brd):
+                        self._show_game_over(True)
+                        return
+                    self._init_game(render=False)
+                    brd = self.board
+                    continue
+                mv = brd.legal_move_at(random.randrange(brd.num_legal_moves()))
+                brd.apply_move(mv)
+                self.last_move = mv
+                self.move_count += 1
+            self.after_id = self.after(0, self._search_mate)
+            return
+        # Switched off: show where the search stopped and keep playing it
+        self.status_var.set(f"Moves: {self.move_count}")
+        self._render_and_schedule()
+
+    def _on_game_over(self, is_mate: bool):
+        if self._require_mate and not is_mate:
+            # Restart new games without drawing them until one ends in checkmate
+            self.status_var.set("Game ended not by mate. Searching for a mate...")
+            self._init_game(render=False)
+            self.after_id = self.after(0, self._search_mate)
+            return
+        self._show_game_over(is_mate)
+
+    def _show_game_over(self, is_mate: bool):
+        msg = "Checkmate!" if is_mate else "Game over (non-mate)."
+        self.status_var.set(f"{msg} Moves: {self.move_count}")
+        rend: Any = self.renderer
+        rend.draw(self.board, self.last_move)
+        self.stop()
+
     def _step_once(self):
-        game = self.game_var.get()
+        brd: Any = self.board
         # Check end conditions
-        brd0: Any = self.board
-        if brd0 is not None and brd0.is_game_over():
-            # Determine if checkmate required and satisfied
-            if game == "chess" and isinstance(brd0, ChessBoard):
-                is_mate = brd0.board.is_checkmate()
-            else:
-                res = brd0.get_result()
-                is_mate = res.get('termination') == 'checkmate'
-
-            if self.require_mate.get() and not is_mate:
-                # Restart a new game searching for a checkmate result
-                self.status_var.set("Game ended not by mate. Restarting...")
-                self._init_game()
-                self._schedule_next()
-                return
-            # End
-            msg = "Checkmate!" if is_mate else "Game over (non-mate)."
-            self.status_var.set(f"{msg} Moves: {self.move_count}")
-            rend2: Any = self.renderer
-            rend2.draw(self.board, self.last_move)
-            self.stop()
+        if brd.is_game_over():
+            self._on_game_over(self._is_mate(brd))
             return
 
-        # Pick a random legal move and apply
-        if game == "chess":
-            brd: Any = self.board
-            legal = brd.get_legal_moves()
-            if not legal:
+        # Pick random legal moves and apply, up to batch_size plies per tick
+        for ply in range(self._batch_size):
+            if ply and brd.is_game_over():
+                break
+            n = brd.num_legal_moves()
+            if not n:
                 # Should be covered by is_game_over, but guard anyway
                 self.status_var.set("No legal moves.")
                 self.stop()
                 return
-            mv = random.choice(legal)
+            mv = brd.legal_move_at(random.randrange(n))
             brd.apply_move(mv)
             self.last_move = mv
-        else:
-            brd2: Any = self.board
-            legal = brd2.get_legal_moves()
-            if not legal:
-                self.status_var.set("No legal moves.")
-                self.stop()
-                return
-            mv = random.choice(legal)
-            brd2.apply_move(mv)
-            self.last_move = mv
+            self.move_count += 1
 
-        self.move_count += 1
-        rend3: Any = self.renderer
-        rend3.draw(self.board, self.last_move)
         self.status_var.set(f"Moves: {self.move_count}")
+        # Render the final position of the batch once Tk is idle
+        self.after_id = self.after_idle(self._render_and_schedule)
+
+    def _render_and_schedule(self):
+        rend: Any = self.renderer
+        rend.draw(self.board, self.last_move)
         self._schedule_next()
 
 